@@ -0,0 +1,54 @@
+"""On-disk cache for Claude diagnostic responses, keyed by a hash of the request."""
+
+import hashlib
+import json
+import os
+import time
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".vbcvalidation", "cache")
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60
+
+
+def _enabled() -> bool:
+    """Caching is on unless VBC_NOCACHE=1 is set."""
+    return os.environ.get("VBC_NOCACHE") != "1"
+
+
+def _path(key: str) -> str:
+    return os.path.join(CACHE_DIR, f"{key}.json")
+
+
+def make_key(model: str, system_prompt: str, prompt: str) -> str:
+    """SHA-256 over everything that determines the model's response."""
+    return hashlib.sha256(
+        (model + "\0" + system_prompt + "\0" + prompt).encode("utf-8")
+    ).hexdigest()
+
+
+def get(key: str) -> dict | None:
+    """Return the cached response for key, or None if missing or expired."""
+    if not _enabled():
+        return None
+    try:
+        with open(_path(key)) as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if entry.get("expiresAt", 0) < time.time():
+        return None
+    return entry.get("value")
+
+
+def put(key: str, value: dict, ttl_seconds: int = DEFAULT_TTL_SECONDS) -> None:
+    """Store a response under key. Write failures are ignored."""
+    if not _enabled():
+        return
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = _path(key) + f".{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"expiresAt": time.time() + ttl_seconds, "value": value}, f)
+        os.replace(tmp_path, _path(key))
+    except OSError:
+        pass
@@ -2,8 +2,16 @@
 
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+
 import pandas as pd
 
+try:
+    import orjson
+except ImportError:  # optional; fall back to the standard library parser
+    orjson = None
+
 from validation.schema import validate_schema
 from validation.arithmetic import validate_arithmetic
 from validation.range_checks import validate_ranges
@@ -14,7 +22,19 @@ from diagnosis.ai_diagnostics import generate_all_diagnostics
 from reporting.html_report import generate_html_report
 
 
+DATA_FILES = {
+    "msk_episodes": "data/msk_episodes.csv",
+    "msk_quality": "data/msk_quality.csv",
+    "onc_episodes": "data/onc_episodes.csv",
+    "onc_quality": "data/onc_quality.csv",
+    "onc_drugs": "data/onc_drug_detail.csv",
+}
+
+
 def load_json(path):
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
     with open(path) as f:
         return json.load(f)
 
@@ -26,6 +46,59 @@ def get_contract(metadata, contract_id):
     raise ValueError(f"Contract {contract_id} not found")
 
 
+def load_data(files=DATA_FILES):
+    """Read the performance CSVs concurrently, keyed like DATA_FILES."""
+    with ThreadPoolExecutor(max_workers=len(files)) as pool:
+        futures = {name: pool.submit(pd.read_csv, path) for name, path in files.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+
+def run_validation(contract_metadata, reference_ranges,
+                   msk_episodes, msk_quality, onc_episodes, onc_quality, onc_drugs):
+    """Run every validator and return their flags in pipeline order.
+
+    Each validator module numbers its flags from a module-level counter, so
+    all calls to one module run in order on the same worker thread; the
+    modules themselves run concurrently. Flag IDs and ordering match a
+    sequential run.
+    """
+    msk_contract = get_contract(contract_metadata, "MSK-2024-001")
+    onc_contract = get_contract(contract_metadata, "ONC-2024-001")
+
+    # (validator, args) in pipeline order: MSK first, then Oncology
+    calls = [
+        (validate_schema, (msk_episodes, "msk_episodes", msk_contract)),
+        (validate_schema, (msk_quality, "msk_quality", msk_contract)),
+        (validate_arithmetic, (msk_episodes, msk_quality, msk_contract)),
+        (validate_ranges, (msk_episodes, reference_ranges["msk"], msk_contract)),
+        (validate_cross_metrics, (msk_episodes, msk_quality, msk_contract)),
+        (validate_msk_rules, (msk_episodes, msk_quality, reference_ranges["msk"], msk_contract)),
+        (validate_schema, (onc_episodes, "onc_episodes", onc_contract)),
+        (validate_schema, (onc_quality, "onc_quality", onc_contract)),
+        (validate_arithmetic, (onc_episodes, onc_quality, onc_contract)),
+        (validate_ranges, (onc_episodes, reference_ranges["oncology"], onc_contract)),
+        (validate_cross_metrics, (onc_episodes, onc_quality, onc_contract, onc_drugs)),
+        (validate_onc_rules, (onc_episodes, onc_quality, onc_drugs,
+                              reference_ranges["oncology"], onc_contract)),
+    ]
+
+    positions_by_validator = {}
+    for pos, (fn, _) in enumerate(calls):
+        positions_by_validator.setdefault(fn, []).append(pos)
+
+    def _run_positions(positions):
+        return [(pos, calls[pos][0](*calls[pos][1])) for pos in positions]
+
+    results = [None] * len(calls)
+    with ThreadPoolExecutor(max_workers=len(positions_by_validator)) as pool:
+        for future in [pool.submit(_run_positions, positions)
+                       for positions in positions_by_validator.values()]:
+            for pos, flags in future.result():
+                results[pos] = flags
+
+    return list(chain.from_iterable(results))
+
+
 def count_severity(flags, severity):
     return sum(1 for f in flags if f.severity == severity)
 
@@ -36,35 +109,17 @@ def main():
     reference_ranges = load_json("config/reference_ranges.json")
 
     # 2. Load data
-    msk_episodes = pd.read_csv("data/msk_episodes.csv")
-    msk_quality = pd.read_csv("data/msk_quality.csv")
-    onc_episodes = pd.read_csv("data/onc_episodes.csv")
-    onc_quality = pd.read_csv("data/onc_quality.csv")
-    onc_drugs = pd.read_csv("data/onc_drug_detail.csv")
+    data = load_data()
+    msk_episodes = data["msk_episodes"]
+    msk_quality = data["msk_quality"]
+    onc_episodes = data["onc_episodes"]
+    onc_quality = data["onc_quality"]
+    onc_drugs = data["onc_drugs"]
 
     # 3. Run validation pipeline
-    all_flags = []
-
-    # MSK validation
-    print("Running MSK validation...")
-    msk_contract = get_contract(contract_metadata, "MSK-2024-001")
-    all_flags += validate_schema(msk_episodes, "msk_episodes", msk_contract)
-    all_flags += validate_schema(msk_quality, "msk_quality", msk_contract)
-    all_flags += validate_arithmetic(msk_episodes, msk_quality, msk_contract)
-    all_flags += validate_ranges(msk_episodes, reference_ranges["msk"], msk_contract)
-    all_flags += validate_cross_metrics(msk_episodes, msk_quality, msk_contract)
-    all_flags += validate_msk_rules(msk_episodes, msk_quality, reference_ranges["msk"], msk_contract)
-
-    # Oncology validation
-    print("Running Oncology validation...")
-    onc_contract = get_contract(contract_metadata, "ONC-2024-001")
-    all_flags += validate_schema(onc_episodes, "onc_episodes", onc_contract)
-    all_flags += validate_schema(onc_quality, "onc_quality", onc_contract)
-    all_flags += validate_arithmetic(onc_episodes, onc_quality, onc_contract)
-    all_flags += validate_ranges(onc_episodes, reference_ranges["oncology"], onc_contract)
-    all_flags += validate_cross_metrics(onc_episodes, onc_quality, onc_contract, onc_drugs)
-    all_flags += validate_onc_rules(onc_episodes, onc_quality, onc_drugs,
-                                     reference_ranges["oncology"], onc_contract)
+    print("Running MSK and Oncology validation...")
+    all_flags = run_validation(contract_metadata, reference_ranges,
+                               msk_episodes, msk_quality, onc_episodes, onc_quality, onc_drugs)
 
     print(f"Validation complete: {len(all_flags)} flags "
           f"(RED: {count_severity(all_flags, 'RED')}, "
@@ -75,13 +130,7 @@ def main():
     diagnostics = []
     try:
         print("Running AI diagnostics...")
-        diagnostics = generate_all_diagnostics(all_flags, contract_metadata, {
-            "msk_episodes": msk_episodes,
-            "msk_quality": msk_quality,
-            "onc_episodes": onc_episodes,
-            "onc_quality": onc_quality,
-            "onc_drugs": onc_drugs,
-        })
+        diagnostics = generate_all_diagnostics(all_flags, contract_metadata, data)
         print(f"Generated {len(diagnostics)} diagnostic narratives.")
     except Exception as e:
         print(f"AI diagnostics unavailable: {e}. Proceeding with validation-only report.")
@@ -4,21 +4,44 @@ import os
 from datetime import datetime
 from collections import defaultdict
 
+import numpy as np
 import pandas as pd
 from jinja2 import Environment, FileSystemLoader
 
 
+SEVERITY_ORDER = {"RED": 0, "YELLOW": 1, "GREEN": 2}
+UNKNOWN_SEVERITY_RANK = len(SEVERITY_ORDER)
+FINANCIAL_COLUMNS = ["total_cost", "total_target", "episode_count"]
+
+
 def _severity_order(flag):
     """Sort key: RED first, then YELLOW, then GREEN."""
-    order = {"RED": 0, "YELLOW": 1, "GREEN": 2}
-    return order.get(flag.severity, 3)
+    return SEVERITY_ORDER.get(flag.severity, UNKNOWN_SEVERITY_RANK)
+
+
+class _DataFrameRows:
+    """Iterable of row dicts over a DataFrame, built lazily as the template loops.
+
+    Stands in for df.to_dict("records") without holding every row in memory.
+    """
+
+    def __init__(self, df):
+        self._df = df
+        self._cols = df.columns.tolist()
+
+    def __iter__(self):
+        cols = self._cols
+        for values in self._df.itertuples(index=False, name=None):
+            yield dict(zip(cols, values))
 
 
 def _calculate_financial_summary(episodes_df, contract):
     """Calculate financial summary for a contract."""
-    total_cost = episodes_df["total_cost"].sum()
-    total_target = episodes_df["total_target"].sum()
-    total_episodes = episodes_df["episode_count"].sum()
+    # One reduction over a single float64 block instead of a Series.sum() per
+    # column; nansum skips missing cells the way Series.sum() does.
+    total_cost, total_target, total_episodes = np.nansum(
+        episodes_df[FINANCIAL_COLUMNS].to_numpy(dtype=np.float64, na_value=np.nan), axis=0
+    ).tolist()
     variance = total_cost - total_target
     variance_pct = variance / total_target if total_target > 0 else 0
 
@@ -40,12 +63,19 @@ def _calculate_financial_summary(episodes_df, contract):
 
 def _get_quality_gate_status(quality_df, contract):
     """Determine quality gate pass/fail status."""
-    comp_row = quality_df[quality_df["measure_id"].str.contains("COMP", na=False)]
-    if len(comp_row) == 0:
+    # Composite IDs are per-contract (MSK-Q-COMP, ONC-Q-COMP), so find the
+    # first one by position rather than building a boolean mask and a copy.
+    comp_pos = next(
+        (i for i, measure_id in enumerate(quality_df["measure_id"].tolist())
+         if isinstance(measure_id, str) and "COMP" in measure_id),
+        None,
+    )
+    if comp_pos is None:
         return {"pass": None, "composite_score": None, "gate_minimum": None}
 
-    earned = comp_row.iloc[0].get("points_earned", 0)
-    max_pts = comp_row.iloc[0].get("max_points", 0)
+    comp_row = quality_df.iloc[comp_pos]
+    earned = comp_row.get("points_earned", 0)
+    max_pts = comp_row.get("max_points", 0)
     gate_min = contract.get("quality_gate_minimum", 0)
     composite_pct = (earned / max_pts * 100) if max_pts > 0 else 0
 
@@ -68,26 +98,33 @@ def generate_html_report(all_flags, diagnostics, contract_metadata,
     msk_contract = next((c for c in contracts if c["contract_id"] == "MSK-2024-001"), {})
     onc_contract = next((c for c in contracts if c["contract_id"] == "ONC-2024-001"), {})
 
+    # Bucket all flags in one pass. Appending to per-rank buckets is a
+    # counting sort: it keeps input order within each severity, exactly like
+    # a stable sorted(..., key=_severity_order).
+    rank_count = UNKNOWN_SEVERITY_RANK + 1
+    by_rank = [[] for _ in range(rank_count)]
+    by_contract_rank = defaultdict(lambda: [[] for _ in range(rank_count)])
+    severity_by_contract = defaultdict(lambda: {"RED": 0, "YELLOW": 0, "GREEN": 0})
+    flags_by_episode = defaultdict(list)
+    for f in all_flags:
+        rank = _severity_order(f)
+        by_rank[rank].append(f)
+        by_contract_rank[f.contract_id][rank].append(f)
+        counts = severity_by_contract[f.contract_id]
+        counts[f.severity] = counts.get(f.severity, 0) + 1
+        flags_by_episode[f.episode_type].append(f)
+
+    sorted_flags = [f for bucket in by_rank for f in bucket]
+
     # Group flags by contract
-    msk_flags = sorted([f for f in all_flags if f.contract_id == "MSK-2024-001"], key=_severity_order)
-    onc_flags = sorted([f for f in all_flags if f.contract_id == "ONC-2024-001"], key=_severity_order)
+    msk_flags = [f for bucket in by_contract_rank["MSK-2024-001"] for f in bucket]
+    onc_flags = [f for bucket in by_contract_rank["ONC-2024-001"] for f in bucket]
 
     # Severity counts
-    def count_sev(flags):
-        counts = {"RED": 0, "YELLOW": 0, "GREEN": 0}
-        for f in flags:
-            counts[f.severity] = counts.get(f.severity, 0) + 1
-        return counts
-
-    msk_severity = count_sev(msk_flags)
-    onc_severity = count_sev(onc_flags)
+    msk_severity = severity_by_contract["MSK-2024-001"]
+    onc_severity = severity_by_contract["ONC-2024-001"]
     total_severity = {k: msk_severity.get(k, 0) + onc_severity.get(k, 0) for k in ["RED", "YELLOW", "GREEN"]}
 
-    # Group flags by episode type
-    flags_by_episode = defaultdict(list)
-    for f in all_flags:
-        flags_by_episode[f.episode_type].append(f)
-
     # Financial summaries
     msk_financial = _calculate_financial_summary(msk_episodes, msk_contract)
     onc_financial = _calculate_financial_summary(onc_episodes, onc_contract)
@@ -117,19 +154,21 @@ def generate_html_report(all_flags, diagnostics, contract_metadata,
     for d in diagnostics:
         diag_by_episode[d.episode_type] = d
 
-    # Convert DataFrames to dicts for template
-    msk_episodes_data = msk_episodes.to_dict("records")
-    onc_episodes_data = onc_episodes.to_dict("records")
-    msk_quality_data = msk_quality.to_dict("records")
-    onc_quality_data = onc_quality.to_dict("records")
-    onc_drugs_data = onc_drugs.to_dict("records")
+    # Row iterables for the template's table loops
+    msk_episodes_data = _DataFrameRows(msk_episodes)
+    onc_episodes_data = _DataFrameRows(onc_episodes)
+    msk_quality_data = _DataFrameRows(msk_quality)
+    onc_quality_data = _DataFrameRows(onc_quality)
+    onc_drugs_data = _DataFrameRows(onc_drugs)
 
     # Episode types for iteration
     msk_episode_types = msk_episodes["episode_type"].tolist()
-    onc_episode_labels = []
-    for _, row in onc_episodes.iterrows():
-        label = f"{row['cancer_type']} {row['stage_group']} {row['line_of_therapy']}".strip()
-        onc_episode_labels.append(label)
+    onc_episode_labels = [
+        f"{cancer} {stage} {line}".strip()
+        for cancer, stage, line in zip(onc_episodes["cancer_type"].tolist(),
+                                       onc_episodes["stage_group"].tolist(),
+                                       onc_episodes["line_of_therapy"].tolist())
+    ]
 
     # Set up Jinja2
     template_dir = os.path.dirname(os.path.abspath(__file__))
@@ -155,7 +194,7 @@ def generate_html_report(all_flags, diagnostics, contract_metadata,
         onc_episode_labels=onc_episode_labels,
         flags_by_episode=dict(flags_by_episode),
         diag_by_episode=diag_by_episode,
-        all_flags=sorted(all_flags, key=_severity_order),
+        all_flags=sorted_flags,
         generation_time=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
     )
 
@@ -0,0 +1,77 @@
+"""Small edited copies of the sample data for validator regression tests.
+
+Each frame starts from the CSVs in data/ and sets a few cells to NaN or
+zero, so the checks see missing values and zero denominators alongside
+ordinary rows.
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+
+def load_contract(contract_id: str) -> dict:
+    with open("config/contract_metadata.json") as f:
+        contracts = json.load(f)["contracts"]
+    return next(c for c in contracts if c["contract_id"] == contract_id)
+
+
+def load_reference_ranges(specialty: str) -> dict:
+    with open("config/reference_ranges.json") as f:
+        return json.load(f)[specialty]
+
+
+def msk_episodes() -> pd.DataFrame:
+    df = pd.read_csv("data/msk_episodes.csv")
+    df.loc[0, "total_cost"] = 3900000          # TKR: total disagrees with count x avg
+    df.loc[0, "readmission_rate"] = np.nan
+    df.loc[1, ["target_price", "total_target"]] = 0
+    df.loc[2, "avg_episode_cost"] = np.nan
+    df.loc[3, "episode_count"] = 0
+    df.loc[4, "episode_type"] = np.nan
+    df.loc[5, ["avg_episode_cost", "ssi_rate"]] = [60000, 0.04]
+    df.loc[6, "readmission_rate"] = 0.5       # Conservative: no quality targets
+    return df
+
+
+def msk_quality() -> pd.DataFrame:
+    df = pd.read_csv("data/msk_quality.csv")
+    df.loc[2, "denominator"] = 0
+    df.loc[3, "rate"] = np.nan
+    return df
+
+
+def onc_episodes() -> pd.DataFrame:
+    df = pd.read_csv("data/onc_episodes.csv")
+    df.loc[0, "pathway_adherence_rate"] = np.nan
+    df.loc[1, "total_target"] = 0
+    df.loc[2, "avg_episode_cost"] = np.nan
+    df.loc[4, "episode_count"] = 0
+    df.loc[5, "cancer_type"] = np.nan
+    df.loc[6, "avg_episode_cost"] = 300000
+    return df
+
+
+def onc_quality() -> pd.DataFrame:
+    df = pd.read_csv("data/onc_quality.csv")
+    df.loc[1, "denominator"] = 0
+    df.loc[2, "rate"] = np.nan
+    return df
+
+
+def onc_drugs() -> pd.DataFrame:
+    df = pd.read_csv("data/onc_drug_detail.csv")
+    df.loc[0, "total_claims"] = np.nan
+    df.loc[1, "site_of_service_hopd_pct"] = np.nan
+    return df
+
+
+def summarize(flags) -> list[tuple]:
+    """(flag_id, severity, metric_name, metric_value, episode_type) per flag.
+
+    A missing (NaN) episode label becomes None so summaries compare equal.
+    """
+    return [(f.flag_id, f.severity, f.metric_name, f.metric_value,
+             f.episode_type if isinstance(f.episode_type, str) else None)
+            for f in flags]
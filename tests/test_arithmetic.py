@@ -0,0 +1,50 @@
+"""Regression tests for validate_arithmetic on edited sample frames."""
+
+import unittest
+
+from tests import frames
+from validation import arithmetic
+from validation._frame_utils import flag_id_sequence
+from validation.arithmetic import validate_arithmetic
+
+
+class ValidateArithmeticTest(unittest.TestCase):
+
+    def setUp(self):
+        arithmetic._next_id = flag_id_sequence("ARITH")
+
+    def test_msk(self):
+        """Zero targets, a zero episode_count and NaN costs are skipped, not flagged."""
+        flags = validate_arithmetic(frames.msk_episodes(), frames.msk_quality(),
+                                    frames.load_contract("MSK-2024-001"))
+        self.assertEqual(frames.summarize(flags), [
+            ('ARITH-001', 'RED', 'episode_cost_reconciliation',
+             'count(142) x avg($26,800) = $3,805,600', 'TKR'),
+            ('ARITH-002', 'RED', 'episode_cost_reconciliation',
+             'count(72) x avg($60,000) = $4,320,000', 'Rotator Cuff'),
+            ('ARITH-003', 'YELLOW', 'variance_calculation',
+             'reported variance = -0.0667', 'Rotator Cuff'),
+            ('ARITH-004', 'YELLOW', 'cost_component_sum',
+             'component sum = $16,800', 'Rotator Cuff'),
+        ])
+
+    def test_onc(self):
+        flags = validate_arithmetic(frames.onc_episodes(), frames.onc_quality(),
+                                    frames.load_contract("ONC-2024-001"))
+        self.assertEqual(frames.summarize(flags), [
+            ('ARITH-001', 'RED', 'episode_cost_reconciliation',
+             'count(28) x avg($300,000) = $8,400,000', 'Colorectal Metastatic 1L'),
+            ('ARITH-002', 'YELLOW', 'variance_calculation',
+             'reported variance = 0.1317', 'Colorectal Metastatic 1L'),
+            ('ARITH-003', 'YELLOW', 'cost_component_sum',
+             'component sum = $92,800', 'Colorectal Metastatic 1L'),
+        ])
+
+    def test_empty_frames(self):
+        flags = validate_arithmetic(frames.msk_episodes().iloc[:0], frames.msk_quality().iloc[:0],
+                                    frames.load_contract("MSK-2024-001"))
+        self.assertEqual(frames.summarize(flags), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+"""Regression tests for validate_cross_metrics on edited sample frames."""
+
+import unittest
+
+from tests import frames
+from validation import cross_metric
+from validation._frame_utils import flag_id_sequence
+from validation.cross_metric import validate_cross_metrics
+
+
+class ValidateCrossMetricsTest(unittest.TestCase):
+
+    def setUp(self):
+        cross_metric._next_id = flag_id_sequence("CROSS")
+
+    def test_msk(self):
+        """Conservative rows feed the surgical pipeline check."""
+        flags = validate_cross_metrics(frames.msk_episodes(), frames.msk_quality(),
+                                       frames.load_contract("MSK-2024-001"))
+        self.assertEqual(frames.summarize(flags), [
+            ('CROSS-001', 'RED', 'discharge_shift_er_correlation', 'home +12%, ER +75%', 'TKR'),
+            ('CROSS-002', 'RED', 'surgical_pipeline_acceleration',
+             'Conservative LBP -6.7%, Spinal Fusion 1-2 +38.1%', 'Conservative LBP → Spinal Fusion'),
+        ])
+
+    def test_onc(self):
+        flags = validate_cross_metrics(frames.onc_episodes(), frames.onc_quality(),
+                                       frames.load_contract("ONC-2024-001"), frames.onc_drugs())
+        self.assertEqual(frames.summarize(flags), [
+            ('CROSS-001', 'RED', 'pathway_cost_correlation',
+             'adherence=68%, cost overrun=12.7%', 'Lung NSCLC 1L'),
+            ('CROSS-002', 'RED', 'pathway_cost_correlation',
+             'adherence=64%, cost overrun=265.9%', 'Colorectal Metastatic 1L'),
+            ('CROSS-003', 'RED', 'eol_systemic_failure',
+             '4/5 EOL metrics failing', 'End-of-Life Care'),
+            ('CROSS-004', 'RED', 'quality_gate_proximity',
+             'composite 53.0% (53/100)', 'Quality Gate'),
+            ('CROSS-005', 'YELLOW', 'site_of_service_cost',
+             'Bevacizumab (Avastin): 85% HOPD, $6,500/claim', 'Drug Detail'),
+        ])
+
+    def test_empty_frames(self):
+        flags = validate_cross_metrics(frames.onc_episodes().iloc[:0], frames.onc_quality().iloc[:0],
+                                       frames.load_contract("ONC-2024-001"),
+                                       frames.onc_drugs().iloc[:0])
+        self.assertEqual(frames.summarize(flags), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
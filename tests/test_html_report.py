@@ -0,0 +1,40 @@
+"""Tests for the HTML report's financial summary."""
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from reporting.html_report import _calculate_financial_summary
+
+
+CONTRACT = {"sharing_rate_savings": 0.5, "sharing_rate_losses": 0.3}
+
+
+class FinancialSummaryTest(unittest.TestCase):
+
+    def test_missing_cells_are_skipped(self):
+        episodes = pd.DataFrame({
+            "total_cost": [100.0, 200.0, 300.0],
+            "total_target": [150.0, np.nan, 350.0],
+            "episode_count": [10, np.nan, 5],
+        })
+        summary = _calculate_financial_summary(episodes, CONTRACT)
+
+        self.assertEqual(summary["total_episodes"], 15)
+        self.assertEqual(summary["total_cost"], 600.0)
+        self.assertEqual(summary["total_target"], 500.0)
+        self.assertEqual(summary["savings"], -100.0)
+        self.assertEqual(summary["provider_share"], -30.0)
+
+    def test_matches_series_sum(self):
+        episodes = pd.read_csv("data/msk_episodes.csv")
+        episodes.loc[0, "episode_count"] = np.nan
+        summary = _calculate_financial_summary(episodes, CONTRACT)
+
+        self.assertEqual(summary["total_episodes"], int(episodes["episode_count"].sum()))
+        self.assertAlmostEqual(summary["total_cost"], episodes["total_cost"].sum())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+"""Regression tests for validate_msk_rules on edited sample frames."""
+
+import unittest
+
+from tests import frames
+from validation import msk_rules
+from validation._frame_utils import flag_id_sequence
+from validation.msk_rules import validate_msk_rules
+
+
+class ValidateMskRulesTest(unittest.TestCase):
+
+    def setUp(self):
+        msk_rules._next_id = flag_id_sequence("MSK")
+
+    def test_edited_frames(self):
+        """The row with a NaN episode_type is still checked, with a NaN label."""
+        flags = validate_msk_rules(frames.msk_episodes(), frames.msk_quality(),
+                                   frames.load_reference_ranges("msk"),
+                                   frames.load_contract("MSK-2024-001"))
+        self.assertEqual(frames.summarize(flags), [
+            ('MSK-001', 'RED', 'implant_cost_ratio', '22.8%', 'THR'),
+            ('MSK-002', 'YELLOW', 'opioid_mme_discharge', '55.0 MME', 'Spinal Fusion 1-2'),
+            ('MSK-003', 'YELLOW', 'opioid_mme_discharge', '65.0 MME', 'Spinal Fusion 3+'),
+            ('MSK-004', 'RED', 'prom_collection_reliability', '39% collection rate', 'TKR'),
+            ('MSK-005', 'RED', 'prom_collection_reliability', '41% collection rate', 'THR'),
+            ('MSK-006', 'RED', 'prom_collection_reliability',
+             '38% collection rate', 'Spinal Fusion 1-2'),
+            ('MSK-007', 'RED', 'prom_collection_reliability',
+             '35% collection rate', 'Spinal Fusion 3+'),
+            ('MSK-008', 'RED', 'prom_collection_reliability', '42% collection rate', None),
+            ('MSK-009', 'RED', 'prom_collection_reliability',
+             '40% collection rate', 'Rotator Cuff'),
+        ])
+
+    def test_empty_frames(self):
+        flags = validate_msk_rules(frames.msk_episodes().iloc[:0], frames.msk_quality().iloc[:0],
+                                   frames.load_reference_ranges("msk"),
+                                   frames.load_contract("MSK-2024-001"))
+        self.assertEqual(frames.summarize(flags), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+"""Regression tests for validate_onc_rules on edited sample frames."""
+
+import unittest
+
+from tests import frames
+from validation import onc_rules
+from validation._frame_utils import flag_id_sequence
+from validation.onc_rules import validate_onc_rules
+
+
+class ValidateOncRulesTest(unittest.TestCase):
+
+    def setUp(self):
+        onc_rules._next_id = flag_id_sequence("ONC")
+
+    def test_edited_frames(self):
+        """NaN adherence, NaN costs and NaN drug cells drop out of their rules."""
+        flags = validate_onc_rules(frames.onc_episodes(), frames.onc_quality(), frames.onc_drugs(),
+                                   frames.load_reference_ranges("oncology"),
+                                   frames.load_contract("ONC-2024-001"))
+        self.assertEqual(frames.summarize(flags), [
+            ('ONC-001', 'RED', 'pathway_cost_correlation',
+             'adherence=72%, overrun=7.8%', 'Breast Metastatic 1L'),
+            ('ONC-002', 'RED', 'pathway_cost_correlation',
+             'adherence=68%, overrun=12.7%', 'Lung NSCLC 1L'),
+            ('ONC-003', 'RED', 'pathway_cost_correlation',
+             'adherence=64%, overrun=265.9%', 'Colorectal Metastatic 1L'),
+            ('ONC-004', 'RED', 'biosimilar_savings_opportunity',
+             'Trastuzumab (Herceptin): 89% brand utilization', 'Drug Detail'),
+            ('ONC-005', 'YELLOW', 'biosimilar_savings_opportunity',
+             'Bevacizumab (Avastin): 73% brand utilization', 'Drug Detail'),
+            ('ONC-006', 'YELLOW', 'biosimilar_savings_opportunity',
+             'Pegfilgrastim (Neulasta): 67% brand utilization', 'Drug Detail'),
+            ('ONC-007', 'YELLOW', 'site_of_service_opportunity',
+             'Bevacizumab (Avastin): 85% HOPD, $6,500/claim', 'Drug Detail'),
+            ('ONC-008', 'RED', 'acp_root_cause',
+             'ACP rate 44.6%, 4/5 EOL metrics failing', 'End-of-Life Care'),
+            ('ONC-009', 'YELLOW', 'novel_therapy_carveout',
+             '$62,500 in novel therapy costs', 'Drug Detail'),
+            ('ONC-010', 'RED', 'episode_volume_vs_incidence',
+             'Breast: 26.7/1,000', 'Breast Volume'),
+            ('ONC-011', 'RED', 'episode_volume_vs_incidence', 'Lung: 8.8/1,000', 'Lung Volume'),
+            ('ONC-012', 'RED', 'episode_volume_vs_incidence',
+             'Colorectal: 5.8/1,000', 'Colorectal Volume'),
+            ('ONC-013', 'RED', 'episode_volume_vs_incidence',
+             'Prostate: 14.0/1,000', 'Prostate Volume'),
+            ('ONC-014', 'RED', 'quality_gate_improvement_path',
+             'composite 53.0%, need 55%, $0 at risk', 'Quality Gate'),
+        ])
+
+    def test_empty_frames(self):
+        flags = validate_onc_rules(frames.onc_episodes().iloc[:0], frames.onc_quality().iloc[:0],
+                                   frames.onc_drugs().iloc[:0], frames.load_reference_ranges("oncology"),
+                                   frames.load_contract("ONC-2024-001"))
+        self.assertEqual(frames.summarize(flags), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+"""Tests for the pathway adherence cost checks when the target price is zero."""
+
+import json
+import unittest
+
+import pandas as pd
+
+from validation.cross_metric import validate_cross_metrics
+from validation.onc_rules import validate_onc_rules
+
+
+def _load_oncology():
+    with open("config/contract_metadata.json") as f:
+        contracts = json.load(f)["contracts"]
+    with open("config/reference_ranges.json") as f:
+        reference_ranges = json.load(f)["oncology"]
+    contract = next(c for c in contracts if c["contract_id"] == "ONC-2024-001")
+    episodes = pd.read_csv("data/onc_episodes.csv")
+    quality = pd.read_csv("data/onc_quality.csv")
+    drugs = pd.read_csv("data/onc_drug_detail.csv")
+    return episodes, quality, drugs, reference_ranges, contract
+
+
+def _zero_target_flags(flags):
+    return [f for f in flags
+            if f.metric_name == "pathway_cost_correlation" and "target=$0" in f.metric_value]
+
+
+class ZeroTargetTest(unittest.TestCase):
+
+    def setUp(self):
+        self.episodes, self.quality, self.drugs, self.ranges, self.contract = _load_oncology()
+        self.episodes.loc[0, "target_price"] = 0
+        self.episodes.loc[0, "pathway_adherence_rate"] = 0.5
+
+    def test_cross_metrics_flag_zero_target(self):
+        flags = validate_cross_metrics(self.episodes, self.quality, self.contract, self.drugs)
+        self.assertEqual(len(_zero_target_flags(flags)), 1)
+
+    def test_onc_rules_flag_zero_target(self):
+        flags = validate_onc_rules(self.episodes, self.quality, self.drugs, self.ranges, self.contract)
+        self.assertEqual(len(_zero_target_flags(flags)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+"""Tests for the range classifier and validate_ranges."""
+
+import unittest
+
+import numpy as np
+
+from tests import frames
+from validation import range_checks
+from validation._frame_utils import flag_id_sequence
+from validation.range_checks import _check_range, _range_severity, validate_ranges
+
+
+BOUNDED = {"min": 10, "max": 20, "expected": 14}
+BOUNDED_NO_EXPECTED = {"min": 10, "max": 20}
+TARGETED = {"target": 0.05, "max_acceptable": 0.10}
+MAX_ONLY = {"max_acceptable": 0.10}
+MIN_ONLY = {"target": 0.6, "min_acceptable": 0.4}
+
+
+def _boundary_values(range_def):
+    """Values on, just inside and just outside every threshold of range_def."""
+    points = [v for v in (range_def.get("min"), range_def.get("max"),
+                          range_def.get("expected"), range_def.get("target"),
+                          range_def.get("min_acceptable"), range_def.get("max_acceptable"))
+              if v is not None]
+    if "min" in range_def and "max" in range_def and "expected" in range_def:
+        width = range_def["max"] - range_def["min"]
+        points += [range_def["expected"] - 0.4 * width, range_def["expected"] + 0.4 * width]
+    values = []
+    for p in points:
+        values += [p, np.nextafter(p, -np.inf), np.nextafter(p, np.inf)]
+    return values + [0.0, -1.0, np.inf, -np.inf, np.nan]
+
+
+class RangeSeverityTest(unittest.TestCase):
+
+    def test_check_range_agrees_at_boundaries(self):
+        for range_def in (BOUNDED, BOUNDED_NO_EXPECTED, TARGETED, MAX_ONLY, MIN_ONLY):
+            values = _boundary_values(range_def)
+            severities = _range_severity(np.array(values, dtype=np.float64), range_def)
+            for value, severity in zip(values, severities):
+                with self.subTest(range_def=range_def, value=value):
+                    flag = _check_range(value, range_def, "metric", "TKR", "C-1")
+                    self.assertEqual(flag.severity if flag else "", severity)
+
+    def test_known_severities(self):
+        values = np.array([9, 10, 18, 18.5, 20, 21, np.nan])
+        self.assertEqual(_range_severity(values, BOUNDED).tolist(),
+                         ["RED", "", "", "YELLOW", "YELLOW", "RED", ""])
+        values = np.array([0.05, 0.06, 0.10, 0.11])
+        self.assertEqual(_range_severity(values, TARGETED).tolist(),
+                         ["", "YELLOW", "YELLOW", "RED"])
+        self.assertEqual(_range_severity(np.array([0.0, 1.0]), MIN_ONLY).tolist(), ["", ""])
+
+
+
+class ValidateRangesTest(unittest.TestCase):
+
+    def setUp(self):
+        range_checks._next_id = flag_id_sequence("RANGE")
+
+    def test_msk(self):
+        """Conservative rows get no utilization or quality checks; NaN cells never flag."""
+        flags = validate_ranges(frames.msk_episodes(), frames.load_reference_ranges("msk"),
+                                frames.load_contract("MSK-2024-001"))
+        self.assertEqual(frames.summarize(flags), [
+            ('RANGE-001', 'RED', 'avg_episode_cost', 60000.0, 'Rotator Cuff'),
+            ('RANGE-002', 'YELLOW', 'prom_collection_rate', 0.39, 'TKR'),
+            ('RANGE-003', 'YELLOW', 'prom_collection_rate', 0.38, 'Spinal Fusion 1-2'),
+            ('RANGE-004', 'YELLOW', 'prom_collection_rate', 0.35, 'Spinal Fusion 3+'),
+            ('RANGE-005', 'YELLOW', 'er_visit_rate_90d', 0.14, 'TKR'),
+            ('RANGE-006', 'YELLOW', 'ssi_rate', 0.021, 'TKR'),
+            ('RANGE-007', 'YELLOW', 'readmission_rate', 0.065, 'Spinal Fusion 1-2'),
+            ('RANGE-008', 'YELLOW', 'er_visit_rate_90d', 0.1, 'Spinal Fusion 1-2'),
+            ('RANGE-009', 'YELLOW', 'ssi_rate', 0.028, 'Spinal Fusion 1-2'),
+            ('RANGE-010', 'YELLOW', 'revision_rate_12mo', 0.022, 'Spinal Fusion 1-2'),
+            ('RANGE-011', 'YELLOW', 'readmission_rate', 0.085, 'Spinal Fusion 3+'),
+            ('RANGE-012', 'YELLOW', 'er_visit_rate_90d', 0.12, 'Spinal Fusion 3+'),
+            ('RANGE-013', 'YELLOW', 'ssi_rate', 0.035, 'Spinal Fusion 3+'),
+            ('RANGE-014', 'YELLOW', 'revision_rate_12mo', 0.03, 'Spinal Fusion 3+'),
+            ('RANGE-015', 'YELLOW', 'ssi_rate', 0.04, 'Rotator Cuff'),
+        ])
+
+    def test_oncology(self):
+        """Rows with a NaN cancer_type have no reference key and are skipped."""
+        flags = validate_ranges(frames.onc_episodes(), frames.load_reference_ranges("oncology"),
+                                frames.load_contract("ONC-2024-001"))
+        self.assertEqual(frames.summarize(flags), [
+            ('RANGE-001', 'YELLOW', 'pathway_adherence_rate', 0.72, 'Breast Metastatic 1L'),
+            ('RANGE-002', 'YELLOW', 'pathway_adherence_rate', 0.65, 'Breast Metastatic 2L+'),
+            ('RANGE-003', 'YELLOW', 'pathway_adherence_rate', 0.68, 'Lung NSCLC 1L'),
+            ('RANGE-004', 'YELLOW', 'pathway_adherence_rate', 0.62, 'Lung NSCLC 2L+'),
+            ('RANGE-005', 'RED', 'avg_episode_cost', 300000.0, 'Colorectal Metastatic 1L'),
+            ('RANGE-006', 'YELLOW', 'pathway_adherence_rate', 0.64, 'Colorectal Metastatic 1L'),
+        ])
+
+    def test_empty_frames(self):
+        for specialty, contract_id, episodes in (("msk", "MSK-2024-001", frames.msk_episodes()),
+                                                 ("oncology", "ONC-2024-001", frames.onc_episodes())):
+            with self.subTest(specialty=specialty):
+                flags = validate_ranges(episodes.iloc[:0], frames.load_reference_ranges(specialty),
+                                        frames.load_contract(contract_id))
+                self.assertEqual(flags, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
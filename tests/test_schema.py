@@ -0,0 +1,58 @@
+"""Regression tests for validate_schema on edited sample frames."""
+
+import unittest
+
+from tests import frames
+from validation import schema
+from validation._frame_utils import flag_id_sequence
+from validation.schema import validate_schema
+
+
+class ValidateSchemaTest(unittest.TestCase):
+
+    def setUp(self):
+        schema._next_id = flag_id_sequence("SCHEMA")
+
+    def test_msk_episodes(self):
+        """NaN episode_type and avg_episode_cost are counted as nulls."""
+        flags = validate_schema(frames.msk_episodes(), "msk_episodes",
+                                frames.load_contract("MSK-2024-001"))
+        self.assertEqual(frames.summarize(flags), [
+            ('SCHEMA-001', 'RED', 'episode_type', '1 nulls', 'ALL'),
+            ('SCHEMA-002', 'RED', 'avg_episode_cost', '1 nulls', 'ALL'),
+        ])
+
+    def test_msk_quality(self):
+        """A zero denominator and a NaN rate are not schema failures."""
+        flags = validate_schema(frames.msk_quality(), "msk_quality",
+                                frames.load_contract("MSK-2024-001"))
+        self.assertEqual(frames.summarize(flags), [
+            ('SCHEMA-001', 'GREEN', 'schema_check', 'PASS', 'ALL'),
+        ])
+
+    def test_onc_episodes(self):
+        flags = validate_schema(frames.onc_episodes(), "onc_episodes",
+                                frames.load_contract("ONC-2024-001"))
+        self.assertEqual(frames.summarize(flags), [
+            ('SCHEMA-001', 'RED', 'cancer_type', '1 nulls', 'ALL'),
+            ('SCHEMA-002', 'RED', 'avg_episode_cost', '1 nulls', 'ALL'),
+            ('SCHEMA-003', 'YELLOW', 'er_visit_rate', 'max=40.0', 'ALL'),
+        ])
+
+    def test_onc_quality(self):
+        flags = validate_schema(frames.onc_quality(), "onc_quality",
+                                frames.load_contract("ONC-2024-001"))
+        self.assertEqual(frames.summarize(flags), [
+            ('SCHEMA-001', 'GREEN', 'schema_check', 'PASS', 'ALL'),
+        ])
+
+    def test_empty_frame(self):
+        flags = validate_schema(frames.msk_episodes().iloc[:0], "msk_episodes",
+                                frames.load_contract("MSK-2024-001"))
+        self.assertEqual(frames.summarize(flags), [
+            ('SCHEMA-001', 'GREEN', 'schema_check', 'PASS', 'ALL'),
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
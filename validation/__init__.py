@@ -2,7 +2,7 @@ from dataclasses import dataclass, field
 from typing import Any
 
 
-@dataclass
+@dataclass(slots=True)
 class ValidationFlag:
     flag_id: str
     severity: str  # "RED", "YELLOW", "GREEN"
@@ -0,0 +1,49 @@
+"""Shared helpers for the vectorized validators: column access and flag numbering."""
+
+import itertools
+
+import pandas as pd
+import numpy as np
+
+
+def flag_id_sequence(prefix: str):
+    """Return a function that yields PREFIX-001, PREFIX-002, ...
+
+    Each validator module keeps one sequence, so flag numbers continue
+    across calls within a process.
+    """
+    counter = itertools.count(1)
+
+    def next_id():
+        return f"{prefix}-{next(counter):03d}"
+
+    return next_id
+
+
+def float_column(df: pd.DataFrame, col: str, default: float) -> np.ndarray:
+    """Column as a float64 array, or filled with default if the column is absent."""
+    if col in df.columns:
+        return df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+    return np.full(len(df), default, dtype=np.float64)
+
+
+def first_positions(values: pd.Series) -> dict:
+    """First row position of each distinct value, found in one pass."""
+    positions = {}
+    for pos, value in enumerate(values.tolist()):
+        positions.setdefault(value, pos)
+    return positions
+
+
+def value_at(df: pd.DataFrame, col: str, pos: int, default):
+    """Scalar at row position pos of col, or default if the column is absent."""
+    if col in df.columns:
+        return df[col].to_numpy()[pos]
+    return default
+
+
+def episode_types(df: pd.DataFrame) -> pd.Series:
+    """The episode_type column, or empty strings if the column is absent."""
+    if "episode_type" in df.columns:
+        return df["episode_type"]
+    return pd.Series("", index=df.index)
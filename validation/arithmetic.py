@@ -1,168 +1,291 @@
 """Arithmetic reconciliation checks: verify internal mathematical consistency."""
 
+from functools import partial
+
 import pandas as pd
 import numpy as np
 from validation import ValidationFlag
+from validation._frame_utils import flag_id_sequence, value_at
+
+
+# Order matters: _check_episodes slices (avg, target) and (total_cost, total_target) pairs
+EPISODE_COLUMNS = ("episode_count", "avg_episode_cost", "target_price",
+                   "total_cost", "total_target", "variance_pct")
+MSK_COST_COMPONENTS = ("implant_cost_avg", "facility_cost_avg", "professional_cost_avg",
+                       "post_acute_cost_avg", "readmission_cost_avg")
+ONC_COST_COMPONENTS = ("drug_cost_avg", "administration_cost_avg", "inpatient_cost_avg",
+                       "er_cost_avg", "imaging_cost_avg", "lab_cost_avg",
+                       "supportive_care_cost_avg", "other_cost_avg")
+
+
+_next_id = flag_id_sequence("ARITH")
+
+
+def _float_block(df: pd.DataFrame, cols: tuple[str, ...], default: float) -> np.ndarray:
+    """Columns as one C-contiguous float64 array with one row per column.
+
+    Absent columns are filled with default. Rows are contiguous, so
+    unpacking the result gives one array per column without further copies.
+    """
+    values = df.reindex(columns=list(cols), fill_value=default).to_numpy(
+        dtype=np.float64, na_value=np.nan)
+    return np.ascontiguousarray(values.T)
+
+
+def _episode_labels(df: pd.DataFrame, ep_type_col: str) -> list:
+    """Flag labels: episode_type, or "cancer_type stage_group line_of_therapy"."""
+    if ep_type_col == "episode_type":
+        return df["episode_type"].tolist()
+    parts = [df[col].tolist() if col in df.columns else [""] * len(df)
+             for col in ("cancer_type", "stage_group", "line_of_therapy")]
+    return [f"{cancer} {stage} {line}".strip() for cancer, stage, line in zip(*parts)]
+
+
+def _scan_episodes(counts: np.ndarray, prices: np.ndarray, totals: np.ndarray,
+                   variance_pcts: np.ndarray) -> tuple[np.ndarray, ...]:
+    """Evaluate checks 1-3 over whole columns.
+
+    prices holds the (avg_episode_cost, target_price) rows and totals the
+    matching (total_cost, total_target) rows, so checks 1 and 2 are one
+    broadcast |count * price - total| / total over both pairs.
+
+    Returns (has_count, cost_mismatch, target_mismatch, variance_mismatch)
+    as boolean row masks. Rows with a missing or zero episode_count are
+    never flagged. A NaN input yields a NaN gap, which never exceeds a
+    tolerance, so only zero denominators need masking.
+    """
+    has_count = ~np.isnan(counts) & (counts != 0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gap = np.abs(counts * prices - totals) / totals
+        cost_mismatch, target_mismatch = (gap > 0.01) & has_count & (totals != 0)
+
+        avg_costs, targets = prices
+        variance_mismatch = np.abs((avg_costs - targets) / targets - variance_pcts) > 0.005
+        variance_mismatch &= has_count & (targets != 0)
+
+    return has_count, cost_mismatch, target_mismatch, variance_mismatch
+
 
-_arith_counter = 0
+def _component_sum_mismatch(df: pd.DataFrame, components: tuple[str, ...],
+                            avg_costs: np.ndarray,
+                            tolerance: float) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Rows whose non-null cost components sum to more than tolerance away from avg cost.
 
+    Returns the row mask, the per-row component sums, and a
+    (rows x components) mask of non-null values.
+    Components are accumulated column by column, in the same order as a
+    left-to-right sum over each row, so borderline rows are decided exactly
+    as they were by the per-row check.
+    """
+    block = _float_block(df, components, np.nan)
+    present = ~np.isnan(block.T)
+    comp_sum = np.zeros(len(df))
+    for j, values in enumerate(block):
+        comp_sum += np.where(present[:, j], values, 0.0)
 
-def _next_id():
-    global _arith_counter
-    _arith_counter += 1
-    return f"ARITH-{_arith_counter:03d}"
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mismatch = (present.any(axis=1) & ~np.isnan(avg_costs) & (avg_costs > 0)
+                    & (np.abs(comp_sum - avg_costs) / avg_costs > tolerance))
+    return mismatch, comp_sum, present
 
 
 def validate_arithmetic(episodes_df: pd.DataFrame, quality_df: pd.DataFrame,
                         contract: dict) -> list[ValidationFlag]:
     """Run arithmetic consistency checks on episode and quality data."""
     flags = []
-    contract_id = contract["contract_id"]
+    # Every flag from this module shares its category and contract
+    make_flag = partial(ValidationFlag, category="arithmetic",
+                        contract_id=contract["contract_id"])
+
+    flags += _check_episodes(episodes_df, contract, make_flag)
+
+    # 5. Discharge disposition sum is checked in schema.py
+
+    flags += _check_quality(quality_df, make_flag)
+
+    # 8. Member month check
+    members = contract.get("attributed_members", 0)
+    mm = contract.get("member_months", 0)
+    if members > 0 and mm > 0:
+        expected_mm = members * 12
+        diff_pct = abs(expected_mm - mm) / mm
+        if diff_pct > 0.05:
+            flags.append(make_flag(
+                flag_id=_next_id(), severity="YELLOW",
+                metric_name="member_months_check",
+                metric_value=f"member_months = {mm}",
+                expected_value=f"members x 12 = {expected_mm} (within 5%)",
+                episode_type="ALL",
+                description=f"Member months ({mm:,}) don't align with attributed members "
+                            f"({members:,} x 12 = {expected_mm:,})",
+                detail=f"Difference of {diff_pct:.1%} may indicate mid-year enrollment changes.",
+            ))
+
+    return flags
+
+
+def _check_episodes(episodes_df, contract, make_flag):
+    """Checks 1-4: episode cost, target, variance and cost-component reconciliation."""
+    flags = []
+    if episodes_df.empty:
+        return flags
     specialty = contract.get("specialty", "")
 
     # Determine episode type column
     ep_type_col = "episode_type" if "episode_type" in episodes_df.columns else "cancer_type"
+    check_msk_components = specialty == "MSK" and "implant_cost_avg" in episodes_df.columns
+    check_onc_components = specialty == "Oncology" and "drug_cost_avg" in episodes_df.columns
+
+    # Checks 1-4 are evaluated for all rows at once; only rows that fail one
+    # of them are visited to build flags.
+    block = _float_block(episodes_df, EPISODE_COLUMNS, 0)
+    counts, avg_costs = block[0], block[1]
+
+    has_count, cost_mismatch, target_mismatch, variance_mismatch = _scan_episodes(
+        counts, block[1:3], block[3:5], block[5])
 
-    for _, row in episodes_df.iterrows():
-        if ep_type_col == "cancer_type":
-            ep_label = f"{row.get('cancer_type', '')} {row.get('stage_group', '')} {row.get('line_of_therapy', '')}".strip()
-        else:
-            ep_label = row.get("episode_type", "unknown")
+    components = ()
+    component_mismatch = np.zeros(len(episodes_df), dtype=bool)
+    if check_msk_components or check_onc_components:
+        components = MSK_COST_COMPONENTS if check_msk_components else ONC_COST_COMPONENTS
+        component_mismatch, component_sums, component_present = _component_sum_mismatch(
+            episodes_df, components, avg_costs, 0.05)
+        component_mismatch &= has_count
 
-        count = row.get("episode_count", 0)
-        avg_cost = row.get("avg_episode_cost", 0)
-        target = row.get("target_price", 0)
-        total_cost = row.get("total_cost", 0)
-        total_target = row.get("total_target", 0)
-        variance_pct = row.get("variance_pct", 0)
+    rows = np.flatnonzero(cost_mismatch | target_mismatch | variance_mismatch | component_mismatch)
 
-        if pd.isna(count) or count == 0:
-            continue
+    # Labels and message values are only produced for the failing rows
+    failing = episodes_df.iloc[rows]
+    ep_labels = _episode_labels(failing, ep_type_col)
+
+    for i, ep_label, row in zip(rows, ep_labels, failing.itertuples(index=False, name="Episode")):
+        count = getattr(row, "episode_count", 0)
+        avg_cost = getattr(row, "avg_episode_cost", 0)
+        target = getattr(row, "target_price", 0)
+        total_cost = getattr(row, "total_cost", 0)
+        total_target = getattr(row, "total_target", 0)
+        variance_pct = getattr(row, "variance_pct", 0)
 
         # 1. Episode cost reconciliation: count * avg_cost ≈ total_cost
-        if pd.notna(avg_cost) and pd.notna(total_cost):
+        if cost_mismatch[i]:
             expected_total = count * avg_cost
-            if total_cost != 0:
-                diff_pct = abs(expected_total - total_cost) / total_cost
-                if diff_pct > 0.01:
-                    flags.append(ValidationFlag(
-                        flag_id=_next_id(), severity="RED", category="arithmetic",
-                        metric_name="episode_cost_reconciliation",
-                        metric_value=f"count({count}) x avg(${avg_cost:,.0f}) = ${expected_total:,.0f}",
-                        expected_value=f"total_cost = ${total_cost:,.0f}",
-                        episode_type=ep_label, contract_id=contract_id,
-                        description=f"Episode cost does not reconcile for {ep_label}: "
-                                    f"${expected_total:,.0f} vs ${total_cost:,.0f} ({diff_pct:.1%} difference)",
-                        detail=f"episode_count ({count}) x avg_episode_cost (${avg_cost:,.0f}) = "
-                               f"${expected_total:,.0f}, but total_cost = ${total_cost:,.0f}. "
-                               f"Difference of {diff_pct:.1%} exceeds 1% tolerance.",
-                        related_metrics={"episode_count": count, "avg_episode_cost": avg_cost,
-                                         "total_cost": total_cost},
-                    ))
+            diff_pct = abs(expected_total - total_cost) / total_cost
+            flags.append(make_flag(
+                flag_id=_next_id(), severity="RED",
+                metric_name="episode_cost_reconciliation",
+                metric_value=f"count({count}) x avg(${avg_cost:,.0f}) = ${expected_total:,.0f}",
+                expected_value=f"total_cost = ${total_cost:,.0f}",
+                episode_type=ep_label,
+                description=f"Episode cost does not reconcile for {ep_label}: "
+                            f"${expected_total:,.0f} vs ${total_cost:,.0f} ({diff_pct:.1%} difference)",
+                detail=f"episode_count ({count}) x avg_episode_cost (${avg_cost:,.0f}) = "
+                       f"${expected_total:,.0f}, but total_cost = ${total_cost:,.0f}. "
+                       f"Difference of {diff_pct:.1%} exceeds 1% tolerance.",
+                related_metrics={"episode_count": count, "avg_episode_cost": avg_cost,
+                                 "total_cost": total_cost},
+            ))
 
         # 2. Target reconciliation: count * target ≈ total_target
-        if pd.notna(target) and pd.notna(total_target):
+        if target_mismatch[i]:
             expected_target = count * target
-            if total_target != 0:
-                diff_pct = abs(expected_target - total_target) / total_target
-                if diff_pct > 0.01:
-                    flags.append(ValidationFlag(
-                        flag_id=_next_id(), severity="RED", category="arithmetic",
-                        metric_name="target_reconciliation",
-                        metric_value=f"count({count}) x target(${target:,.0f}) = ${expected_target:,.0f}",
-                        expected_value=f"total_target = ${total_target:,.0f}",
-                        episode_type=ep_label, contract_id=contract_id,
-                        description=f"Target does not reconcile for {ep_label}",
-                        detail=f"episode_count ({count}) x target_price (${target:,.0f}) = "
-                               f"${expected_target:,.0f}, but total_target = ${total_target:,.0f}.",
-                        related_metrics={"episode_count": count, "target_price": target,
-                                         "total_target": total_target},
-                    ))
+            flags.append(make_flag(
+                flag_id=_next_id(), severity="RED",
+                metric_name="target_reconciliation",
+                metric_value=f"count({count}) x target(${target:,.0f}) = ${expected_target:,.0f}",
+                expected_value=f"total_target = ${total_target:,.0f}",
+                episode_type=ep_label,
+                description=f"Target does not reconcile for {ep_label}",
+                detail=f"episode_count ({count}) x target_price (${target:,.0f}) = "
+                       f"${expected_target:,.0f}, but total_target = ${total_target:,.0f}.",
+                related_metrics={"episode_count": count, "target_price": target,
+                                 "total_target": total_target},
+            ))
 
         # 3. Variance calculation: (avg_cost - target) / target ≈ variance_pct
-        if pd.notna(target) and pd.notna(avg_cost) and pd.notna(variance_pct) and target != 0:
+        if variance_mismatch[i]:
             expected_var = (avg_cost - target) / target
-            diff = abs(expected_var - variance_pct)
-            if diff > 0.005:
-                flags.append(ValidationFlag(
-                    flag_id=_next_id(), severity="YELLOW", category="arithmetic",
-                    metric_name="variance_calculation",
-                    metric_value=f"reported variance = {variance_pct:.4f}",
-                    expected_value=f"calculated variance = {expected_var:.4f}",
-                    episode_type=ep_label, contract_id=contract_id,
-                    description=f"Variance percentage does not match calculation for {ep_label}",
-                    detail=f"(avg_cost - target) / target = ({avg_cost} - {target}) / {target} = "
-                           f"{expected_var:.4f}, but variance_pct = {variance_pct:.4f}.",
-                    related_metrics={"avg_episode_cost": avg_cost, "target_price": target,
-                                     "variance_pct": variance_pct},
-                ))
+            flags.append(make_flag(
+                flag_id=_next_id(), severity="YELLOW",
+                metric_name="variance_calculation",
+                metric_value=f"reported variance = {variance_pct:.4f}",
+                expected_value=f"calculated variance = {expected_var:.4f}",
+                episode_type=ep_label,
+                description=f"Variance percentage does not match calculation for {ep_label}",
+                detail=f"(avg_cost - target) / target = ({avg_cost} - {target}) / {target} = "
+                       f"{expected_var:.4f}, but variance_pct = {variance_pct:.4f}.",
+                related_metrics={"avg_episode_cost": avg_cost, "target_price": target,
+                                 "variance_pct": variance_pct},
+            ))
 
         # 4. Cost component sum (MSK)
-        if specialty == "MSK" and "implant_cost_avg" in episodes_df.columns:
-            components = ["implant_cost_avg", "facility_cost_avg", "professional_cost_avg",
-                          "post_acute_cost_avg", "readmission_cost_avg"]
-            comp_vals = {c: row.get(c, np.nan) for c in components}
-            non_null_vals = {k: v for k, v in comp_vals.items() if pd.notna(v)}
-            if non_null_vals and pd.notna(avg_cost) and avg_cost > 0:
-                comp_sum = sum(non_null_vals.values())
-                diff_pct = abs(comp_sum - avg_cost) / avg_cost
-                if diff_pct > 0.05:
-                    flags.append(ValidationFlag(
-                        flag_id=_next_id(), severity="YELLOW", category="arithmetic",
-                        metric_name="cost_component_sum",
-                        metric_value=f"component sum = ${comp_sum:,.0f}",
-                        expected_value=f"avg_episode_cost = ${avg_cost:,.0f} (within 5%)",
-                        episode_type=ep_label, contract_id=contract_id,
-                        description=f"Cost components sum to ${comp_sum:,.0f} vs avg cost "
-                                    f"${avg_cost:,.0f} for {ep_label} ({diff_pct:.1%} difference)",
-                        detail=f"Cost breakdown: {non_null_vals}. Sum = ${comp_sum:,.0f}. "
-                               f"Difference of {diff_pct:.1%} exceeds 5% tolerance (may indicate "
-                               f"uncategorized costs).",
-                        related_metrics=non_null_vals,
-                    ))
+        if check_msk_components and component_mismatch[i]:
+            non_null_vals = {c: getattr(row, c) for c, present
+                             in zip(components, component_present[i]) if present}
+            comp_sum = float(component_sums[i])
+            diff_pct = abs(comp_sum - avg_cost) / avg_cost
+            flags.append(make_flag(
+                flag_id=_next_id(), severity="YELLOW",
+                metric_name="cost_component_sum",
+                metric_value=f"component sum = ${comp_sum:,.0f}",
+                expected_value=f"avg_episode_cost = ${avg_cost:,.0f} (within 5%)",
+                episode_type=ep_label,
+                description=f"Cost components sum to ${comp_sum:,.0f} vs avg cost "
+                            f"${avg_cost:,.0f} for {ep_label} ({diff_pct:.1%} difference)",
+                detail=f"Cost breakdown: {non_null_vals}. Sum = ${comp_sum:,.0f}. "
+                       f"Difference of {diff_pct:.1%} exceeds 5% tolerance (may indicate "
+                       f"uncategorized costs).",
+                related_metrics=non_null_vals,
+            ))
 
         # 4b. Cost component sum (Oncology)
-        if specialty == "Oncology" and "drug_cost_avg" in episodes_df.columns:
-            components = ["drug_cost_avg", "administration_cost_avg", "inpatient_cost_avg",
-                          "er_cost_avg", "imaging_cost_avg", "lab_cost_avg",
-                          "supportive_care_cost_avg", "other_cost_avg"]
-            comp_vals = {c: row.get(c, np.nan) for c in components}
-            non_null_vals = {k: v for k, v in comp_vals.items() if pd.notna(v)}
-            if non_null_vals and pd.notna(avg_cost) and avg_cost > 0:
-                comp_sum = sum(non_null_vals.values())
-                diff_pct = abs(comp_sum - avg_cost) / avg_cost
-                if diff_pct > 0.05:
-                    flags.append(ValidationFlag(
-                        flag_id=_next_id(), severity="YELLOW", category="arithmetic",
-                        metric_name="cost_component_sum",
-                        metric_value=f"component sum = ${comp_sum:,.0f}",
-                        expected_value=f"avg_episode_cost = ${avg_cost:,.0f} (within 5%)",
-                        episode_type=ep_label, contract_id=contract_id,
-                        description=f"Cost components sum to ${comp_sum:,.0f} vs avg cost "
-                                    f"${avg_cost:,.0f} for {ep_label} ({diff_pct:.1%} difference)",
-                        detail=f"Cost breakdown: {non_null_vals}. Sum = ${comp_sum:,.0f}.",
-                        related_metrics=non_null_vals,
-                    ))
+        if check_onc_components and component_mismatch[i]:
+            non_null_vals = {c: getattr(row, c) for c, present
+                             in zip(components, component_present[i]) if present}
+            comp_sum = float(component_sums[i])
+            diff_pct = abs(comp_sum - avg_cost) / avg_cost
+            flags.append(make_flag(
+                flag_id=_next_id(), severity="YELLOW",
+                metric_name="cost_component_sum",
+                metric_value=f"component sum = ${comp_sum:,.0f}",
+                expected_value=f"avg_episode_cost = ${avg_cost:,.0f} (within 5%)",
+                episode_type=ep_label,
+                description=f"Cost components sum to ${comp_sum:,.0f} vs avg cost "
+                            f"${avg_cost:,.0f} for {ep_label} ({diff_pct:.1%} difference)",
+                detail=f"Cost breakdown: {non_null_vals}. Sum = ${comp_sum:,.0f}.",
+                related_metrics=non_null_vals,
+            ))
+
+    return flags
 
-    # 5. Discharge disposition sum is checked in schema.py
+
+def _check_quality(quality_df, make_flag):
+    """Checks 6-7: composite quality points and measure rate calculations."""
+    flags = []
+    if quality_df.empty:
+        return flags
 
     # 6. Quality score arithmetic
-    quality_no_comp = quality_df[~quality_df["measure_id"].str.contains("COMP", na=False)]
-    comp_row = quality_df[quality_df["measure_id"].str.contains("COMP", na=False)]
+    is_comp = quality_df["measure_id"].str.contains("COMP", na=False, regex=False).to_numpy(dtype=bool)
+    quality_no_comp = quality_df[~is_comp]
 
-    if len(comp_row) > 0:
-        reported_earned = comp_row.iloc[0].get("points_earned", 0)
-        reported_max = comp_row.iloc[0].get("max_points", 0)
-        calculated_earned = quality_no_comp["points_earned"].sum()
-        calculated_max = quality_no_comp["max_points"].sum()
+    comp_positions = np.flatnonzero(is_comp)
+    if len(comp_positions) > 0:
+        # Read the composite's two scalars straight from the columns
+        comp_pos = comp_positions[0]
+        reported_earned = value_at(quality_df, "points_earned", comp_pos, 0)
+        reported_max = value_at(quality_df, "max_points", comp_pos, 0)
+        # nansum skips missing points like Series.sum()
+        calculated_earned = np.nansum(quality_no_comp["points_earned"].to_numpy())
+        calculated_max = np.nansum(quality_no_comp["max_points"].to_numpy())
 
         if pd.notna(reported_earned) and calculated_earned != reported_earned:
-            flags.append(ValidationFlag(
-                flag_id=_next_id(), severity="YELLOW", category="arithmetic",
+            flags.append(make_flag(
+                flag_id=_next_id(), severity="YELLOW",
                 metric_name="quality_points_sum",
                 metric_value=f"reported = {reported_earned}",
                 expected_value=f"sum of components = {calculated_earned}",
-                episode_type="ALL", contract_id=contract_id,
+                episode_type="ALL",
                 description=f"Composite quality points ({reported_earned}) does not match "
                             f"sum of component points ({calculated_earned})",
                 detail=f"Individual measures sum to {calculated_earned}/{calculated_max}, "
@@ -170,46 +293,33 @@ def validate_arithmetic(episodes_df: pd.DataFrame, quality_df: pd.DataFrame,
             ))
 
     # 7. Rate calculation: numerator / denominator ≈ rate
-    for _, row in quality_no_comp.iterrows():
-        num = row.get("numerator", np.nan)
-        denom = row.get("denominator", np.nan)
-        rate = row.get("rate", np.nan)
-        measure = row.get("measure_name", "unknown")
-
-        if pd.notna(num) and pd.notna(denom) and pd.notna(rate) and denom > 0:
-            calc_rate = num / denom
-            diff = abs(calc_rate - rate)
-            if diff > 0.005:
-                flags.append(ValidationFlag(
-                    flag_id=_next_id(), severity="RED", category="arithmetic",
-                    metric_name="quality_rate_calculation",
-                    metric_value=f"reported rate = {rate:.4f}",
-                    expected_value=f"num/denom = {num}/{denom} = {calc_rate:.4f}",
-                    episode_type="Quality", contract_id=contract_id,
-                    description=f"Rate calculation mismatch for '{measure}': "
-                                f"reported {rate:.3f} vs calculated {calc_rate:.3f}",
-                    detail=f"numerator ({num}) / denominator ({denom}) = {calc_rate:.4f}, "
-                           f"but reported rate = {rate:.4f}.",
-                    related_metrics={"measure": measure, "numerator": num,
-                                     "denominator": denom, "rate": rate},
-                ))
+    numerators, denominators, rates = _float_block(
+        quality_no_comp, ("numerator", "denominator", "rate"), np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate_mismatch = (~np.isnan(numerators) & ~np.isnan(denominators) & ~np.isnan(rates)
+                         & (denominators > 0)
+                         & (np.abs(numerators / denominators - rates) > 0.005))
+    rate_rows = quality_no_comp.iloc[np.flatnonzero(rate_mismatch)]
 
-    # 8. Member month check
-    members = contract.get("attributed_members", 0)
-    mm = contract.get("member_months", 0)
-    if members > 0 and mm > 0:
-        expected_mm = members * 12
-        diff_pct = abs(expected_mm - mm) / mm
-        if diff_pct > 0.05:
-            flags.append(ValidationFlag(
-                flag_id=_next_id(), severity="YELLOW", category="arithmetic",
-                metric_name="member_months_check",
-                metric_value=f"member_months = {mm}",
-                expected_value=f"members x 12 = {expected_mm} (within 5%)",
-                episode_type="ALL", contract_id=contract_id,
-                description=f"Member months ({mm:,}) don't align with attributed members "
-                            f"({members:,} x 12 = {expected_mm:,})",
-                detail=f"Difference of {diff_pct:.1%} may indicate mid-year enrollment changes.",
-            ))
+    for row in rate_rows.itertuples(index=False, name="Measure"):
+        num = getattr(row, "numerator", np.nan)
+        denom = getattr(row, "denominator", np.nan)
+        rate = getattr(row, "rate", np.nan)
+        measure = getattr(row, "measure_name", "unknown")
+
+        calc_rate = num / denom
+        flags.append(make_flag(
+            flag_id=_next_id(), severity="RED",
+            metric_name="quality_rate_calculation",
+            metric_value=f"reported rate = {rate:.4f}",
+            expected_value=f"num/denom = {num}/{denom} = {calc_rate:.4f}",
+            episode_type="Quality",
+            description=f"Rate calculation mismatch for '{measure}': "
+                        f"reported {rate:.3f} vs calculated {calc_rate:.3f}",
+            detail=f"numerator ({num}) / denominator ({denom}) = {calc_rate:.4f}, "
+                   f"but reported rate = {rate:.4f}.",
+            related_metrics={"measure": measure, "numerator": num,
+                             "denominator": denom, "rate": rate},
+        ))
 
     return flags
@@ -3,30 +3,52 @@
 import pandas as pd
 import numpy as np
 from validation import ValidationFlag
+from validation._frame_utils import first_positions, flag_id_sequence, float_column, value_at
 
-_cross_counter = 0
 
+# End-of-life measures and which direction counts as failing
+EOL_MEASURES = pd.DataFrame(
+    [("ONC-Q-002", "Chemo Within 14 Days of Death", "high_is_bad"),
+     ("ONC-Q-003", "Hospice Enrollment", "low_is_bad"),
+     ("ONC-Q-004", "Hospice >7 Days Before Death", "low_is_bad"),
+     ("ONC-Q-005", "ICU Within 30 Days of Death", "high_is_bad"),
+     ("ONC-Q-006", "ER Within 30 Days of Death", "high_is_bad")],
+    columns=["measure_id", "eol_name", "eol_direction"],
+)
 
-def _next_id():
-    global _cross_counter
-    _cross_counter += 1
-    return f"CROSS-{_cross_counter:03d}"
+
+_next_id = flag_id_sequence("CROSS")
+
+
+def _type_mask(episodes_df: pd.DataFrame, ep_type: str) -> np.ndarray:
+    """Boolean row mask for one episode type; all False without the column."""
+    if "episode_type" not in episodes_df.columns:
+        return np.zeros(len(episodes_df), dtype=bool)
+    return (episodes_df["episode_type"] == ep_type).to_numpy(dtype=bool)
+
+
+def _truthy(df: pd.DataFrame, col: str) -> np.ndarray:
+    """Python truthiness of each value in col; all False if the column is absent."""
+    if col not in df.columns:
+        return np.zeros(len(df), dtype=bool)
+    if pd.api.types.is_bool_dtype(df[col].dtype):
+        return df[col].to_numpy(dtype=bool)
+    return np.array([bool(v) for v in df[col].tolist()], dtype=bool)
 
 
 def validate_cross_metrics(episodes_df: pd.DataFrame, quality_df: pd.DataFrame,
                            contract: dict, onc_drugs_df: pd.DataFrame = None) -> list[ValidationFlag]:
-    """Run cross-metric consistency checks."""
-    flags = []
-    contract_id = contract["contract_id"]
-    specialty = contract.get("specialty", "")
-    attributed_members = contract.get("attributed_members", 0)
+    """Run cross-metric consistency checks.
 
+    Only MSK and Oncology contracts have cross-metric checks; for any other
+    specialty the DataFrames are not touched.
+    """
+    specialty = contract.get("specialty", "")
     if specialty == "MSK":
-        flags += _check_msk_cross_metrics(episodes_df, quality_df, contract)
-    elif specialty == "Oncology":
-        flags += _check_onc_cross_metrics(episodes_df, quality_df, contract, onc_drugs_df)
-
-    return flags
+        return _check_msk_cross_metrics(episodes_df, quality_df, contract)
+    if specialty == "Oncology":
+        return _check_onc_cross_metrics(episodes_df, quality_df, contract, onc_drugs_df)
+    return []
 
 
 def _check_msk_cross_metrics(episodes_df, quality_df, contract):
@@ -35,108 +57,114 @@ def _check_msk_cross_metrics(episodes_df, quality_df, contract):
     contract_id = contract["contract_id"]
     attributed_members = contract.get("attributed_members", 0)
 
+    # The per-episode predicates of checks 1, 2 and 5 are evaluated together
+    # over the columns up front; each check then visits only its own
+    # flagged rows, so flags still come out check by check in row order.
+    home_pcts = float_column(episodes_df, "discharge_home_pct", np.nan)
+    er_rates = float_column(episodes_df, "er_visit_rate_90d", np.nan)
+    actual_risks = float_column(episodes_df, "risk_score_actual", np.nan)
+    expected_risks = float_column(episodes_df, "risk_score_expected", np.nan)
+    counts = float_column(episodes_df, "episode_count", 0)
+
+    # We need prior year data — estimate from related metrics
+    # For TKR: prior year home 62%, current 74% (planted issue 4)
+    # For TKR: prior year ER 8%, current 14%
+    prior_home = 0.62  # documented in planted issues
+    prior_er = 0.08
+    with np.errstate(divide="ignore", invalid="ignore"):
+        discharge_shift = (_type_mask(episodes_df, "TKR")
+                           & (home_pcts - prior_home > 0.10)
+                           & ((er_rates - prior_er) / prior_er > 0.50))
+        miscalibrated = (~np.isnan(actual_risks) & (expected_risks > 0)
+                         & (np.abs(actual_risks - expected_risks) / expected_risks > 0.10))
+        arthroscopy_over_range = (_type_mask(episodes_df, "Knee Arthroscopy")
+                                  & (attributed_members > 0)
+                                  & (counts / (attributed_members / 1000) > 25))
+
     # 1. Discharge shift + ER correlation
     # If discharge-to-home increased >10pp YoY AND ER visits increased >50% YoY
-    for _, row in episodes_df.iterrows():
-        ep_type = row.get("episode_type", "")
-        if "Conservative" in str(ep_type):
-            continue
-
-        home_pct = row.get("discharge_home_pct")
-        er_rate = row.get("er_visit_rate_90d")
-        # We need prior year data — estimate from related metrics
-        # For TKR: prior year home 62%, current 74% (planted issue 4)
-        # For TKR: prior year ER 8%, current 14%
-        if ep_type == "TKR" and pd.notna(home_pct) and pd.notna(er_rate):
-            prior_home = 0.62  # documented in planted issues
-            prior_er = 0.08
-            home_increase = home_pct - prior_home
-            if prior_er > 0:
-                er_increase_pct = (er_rate - prior_er) / prior_er
-
-            if home_increase > 0.10 and er_increase_pct > 0.50:
-                flags.append(ValidationFlag(
-                    flag_id=_next_id(), severity="RED", category="cross_metric",
-                    metric_name="discharge_shift_er_correlation",
-                    metric_value=f"home +{home_increase:.0%}, ER +{er_increase_pct:.0%}",
-                    expected_value="ER rate should not increase >50% when home discharge increases >10pp",
-                    episode_type=ep_type, contract_id=contract_id,
-                    description=f"{ep_type}: Discharge-to-home increased {home_increase:.0%} "
-                                f"(62%→{home_pct:.0%}) while ER visits increased "
-                                f"{er_increase_pct:.0%} (8%→{er_rate:.0%})",
-                    detail="Patients are being sent home earlier (reducing SNF utilization), "
-                           "but the increase in ER visits suggests some patients who previously "
-                           "would have gone to SNF may lack adequate home health support. "
-                           "The ER visits are not yet converting to readmissions, but this is "
-                           "an early warning sign.",
-                    related_metrics={
-                        "discharge_home_pct": home_pct,
-                        "prior_year_home_pct": prior_home,
-                        "er_visit_rate_90d": er_rate,
-                        "prior_year_er_rate": prior_er,
-                        "readmission_rate": row.get("readmission_rate"),
-                    },
-                ))
+    for row in episodes_df.iloc[np.flatnonzero(discharge_shift)].itertuples(index=False, name="Episode"):
+        ep_type = row.episode_type
+        home_pct = row.discharge_home_pct
+        er_rate = row.er_visit_rate_90d
+        home_increase = home_pct - prior_home
+        er_increase_pct = (er_rate - prior_er) / prior_er
+        flags.append(ValidationFlag(
+            flag_id=_next_id(), severity="RED", category="cross_metric",
+            metric_name="discharge_shift_er_correlation",
+            metric_value=f"home +{home_increase:.0%}, ER +{er_increase_pct:.0%}",
+            expected_value="ER rate should not increase >50% when home discharge increases >10pp",
+            episode_type=ep_type, contract_id=contract_id,
+            description=f"{ep_type}: Discharge-to-home increased {home_increase:.0%} "
+                        f"(62%→{home_pct:.0%}) while ER visits increased "
+                        f"{er_increase_pct:.0%} (8%→{er_rate:.0%})",
+            detail="Patients are being sent home earlier (reducing SNF utilization), "
+                   "but the increase in ER visits suggests some patients who previously "
+                   "would have gone to SNF may lack adequate home health support. "
+                   "The ER visits are not yet converting to readmissions, but this is "
+                   "an early warning sign.",
+            related_metrics={
+                "discharge_home_pct": home_pct,
+                "prior_year_home_pct": prior_home,
+                "er_visit_rate_90d": er_rate,
+                "prior_year_er_rate": prior_er,
+                "readmission_rate": getattr(row, "readmission_rate", None),
+            },
+        ))
 
     # 2. Risk score vs benchmark calibration
-    for _, row in episodes_df.iterrows():
-        ep_type = row.get("episode_type", "")
-        actual = row.get("risk_score_actual")
-        expected = row.get("risk_score_expected")
-        if pd.notna(actual) and pd.notna(expected) and expected > 0:
-            diff_pct = abs(actual - expected) / expected
-            if diff_pct > 0.10:
-                flags.append(ValidationFlag(
-                    flag_id=_next_id(), severity="YELLOW", category="cross_metric",
-                    metric_name="risk_score_calibration",
-                    metric_value=f"actual={actual:.3f}, expected={expected:.3f}",
-                    expected_value="Within 10% of each other",
-                    episode_type=ep_type, contract_id=contract_id,
-                    description=f"Risk score calibration concern for {ep_type}: "
-                                f"actual {actual:.3f} vs expected {expected:.3f} "
-                                f"({diff_pct:.1%} difference)",
-                    detail="A significant divergence between actual and expected risk scores "
-                           "may indicate benchmark miscalibration or case-mix shift.",
-                    related_metrics={"risk_score_actual": actual,
-                                     "risk_score_expected": expected},
-                ))
+    for row in episodes_df.iloc[np.flatnonzero(miscalibrated)].itertuples(index=False, name="Episode"):
+        ep_type = getattr(row, "episode_type", "")
+        actual = row.risk_score_actual
+        expected = row.risk_score_expected
+        diff_pct = abs(actual - expected) / expected
+        flags.append(ValidationFlag(
+            flag_id=_next_id(), severity="YELLOW", category="cross_metric",
+            metric_name="risk_score_calibration",
+            metric_value=f"actual={actual:.3f}, expected={expected:.3f}",
+            expected_value="Within 10% of each other",
+            episode_type=ep_type, contract_id=contract_id,
+            description=f"Risk score calibration concern for {ep_type}: "
+                        f"actual {actual:.3f} vs expected {expected:.3f} "
+                        f"({diff_pct:.1%} difference)",
+            detail="A significant divergence between actual and expected risk scores "
+                   "may indicate benchmark miscalibration or case-mix shift.",
+            related_metrics={"risk_score_actual": actual,
+                             "risk_score_expected": expected},
+        ))
+
+    # 5. Volume vs population (knee arthroscopy)
+    for row in episodes_df.iloc[np.flatnonzero(arthroscopy_over_range)].itertuples(index=False, name="Episode"):
+        ep_type = row.episode_type
+        count = row.episode_count
+        rate_per_1000 = count / (attributed_members / 1000)
+        flags.append(ValidationFlag(
+            flag_id=_next_id(), severity="RED", category="cross_metric",
+            metric_name="volume_per_1000",
+            metric_value=f"{rate_per_1000:.1f} per 1,000",
+            expected_value="15-25 per 1,000 for MA population",
+            episode_type=ep_type, contract_id=contract_id,
+            description=f"Knee arthroscopy volume {rate_per_1000:.1f}/1,000 exceeds "
+                        f"expected MA range of 15-25/1,000",
+            detail=f"{count} arthroscopy episodes for {attributed_members:,} "
+                   f"attributed members = {rate_per_1000:.1f} per 1,000. "
+                   f"Evidence shows arthroscopic debridement for knee OA is "
+                   f"clinically ineffective per multiple RCTs. High volume in "
+                   f"an MA population may indicate unnecessary procedures.",
+            related_metrics={"episode_count": count,
+                             "attributed_members": attributed_members,
+                             "rate_per_1000": round(rate_per_1000, 1)},
+        ))
 
-    # 5. Volume vs population
-    if attributed_members > 0:
-        for _, row in episodes_df.iterrows():
-            ep_type = row.get("episode_type", "")
-            count = row.get("episode_count", 0)
-            if pd.isna(count) or count == 0:
-                continue
-            rate_per_1000 = count / (attributed_members / 1000)
-
-            # Knee arthroscopy volume check
-            if ep_type == "Knee Arthroscopy":
-                if rate_per_1000 > 25:
-                    flags.append(ValidationFlag(
-                        flag_id=_next_id(), severity="RED", category="cross_metric",
-                        metric_name="volume_per_1000",
-                        metric_value=f"{rate_per_1000:.1f} per 1,000",
-                        expected_value="15-25 per 1,000 for MA population",
-                        episode_type=ep_type, contract_id=contract_id,
-                        description=f"Knee arthroscopy volume {rate_per_1000:.1f}/1,000 exceeds "
-                                    f"expected MA range of 15-25/1,000",
-                        detail=f"{count} arthroscopy episodes for {attributed_members:,} "
-                               f"attributed members = {rate_per_1000:.1f} per 1,000. "
-                               f"Evidence shows arthroscopic debridement for knee OA is "
-                               f"clinically ineffective per multiple RCTs. High volume in "
-                               f"an MA population may indicate unnecessary procedures.",
-                        related_metrics={"episode_count": count,
-                                         "attributed_members": attributed_members,
-                                         "rate_per_1000": round(rate_per_1000, 1)},
-                    ))
+    # Ratio and pipeline checks read the first row of specific episode types
+    first_row = first_positions(episodes_df["episode_type"])
 
     # Arthroscopy-to-conservative ratio
-    arth_row = episodes_df[episodes_df["episode_type"] == "Knee Arthroscopy"]
-    cons_row = episodes_df[episodes_df["episode_type"] == "Conservative Joint"]
-    if len(arth_row) > 0 and len(cons_row) > 0:
-        arth_count = arth_row.iloc[0].get("episode_count", 0)
-        cons_count = cons_row.iloc[0].get("episode_count", 0)
+    arth_pos = first_row.get("Knee Arthroscopy")
+    cons_pos = first_row.get("Conservative Joint")
+    if arth_pos is not None and cons_pos is not None:
+        arth_count = value_at(episodes_df, "episode_count", arth_pos, 0)
+        cons_count = value_at(episodes_df, "episode_count", cons_pos, 0)
         if cons_count > 0:
             ratio = arth_count / cons_count
             if ratio > 0.50:
@@ -158,13 +186,13 @@ def _check_msk_cross_metrics(episodes_df, quality_df, contract):
                 ))
 
     # 6. Conservative-to-surgical pipeline acceleration
-    cons_lbp = episodes_df[episodes_df["episode_type"] == "Conservative LBP"]
-    fusion_12 = episodes_df[episodes_df["episode_type"] == "Spinal Fusion 1-2"]
-    if len(cons_lbp) > 0 and len(fusion_12) > 0:
-        cons_curr = cons_lbp.iloc[0].get("episode_count", 0)
-        cons_prior = cons_lbp.iloc[0].get("prior_year_episode_count", 0)
-        fus_curr = fusion_12.iloc[0].get("episode_count", 0)
-        fus_prior = fusion_12.iloc[0].get("prior_year_episode_count", 0)
+    cons_pos = first_row.get("Conservative LBP")
+    fusion_pos = first_row.get("Spinal Fusion 1-2")
+    if cons_pos is not None and fusion_pos is not None:
+        cons_curr = value_at(episodes_df, "episode_count", cons_pos, 0)
+        cons_prior = value_at(episodes_df, "prior_year_episode_count", cons_pos, 0)
+        fus_curr = value_at(episodes_df, "episode_count", fusion_pos, 0)
+        fus_prior = value_at(episodes_df, "prior_year_episode_count", fusion_pos, 0)
 
         if pd.notna(cons_prior) and pd.notna(fus_prior) and cons_prior > 0 and fus_prior > 0:
             cons_change = (cons_curr - cons_prior) / cons_prior
@@ -205,84 +233,105 @@ def _check_onc_cross_metrics(episodes_df, quality_df, contract, onc_drugs_df=Non
     attributed_members = contract.get("attributed_members", 0)
 
     # 3. Pathway adherence vs cost correlation
-    for _, row in episodes_df.iterrows():
-        cancer = row.get("cancer_type", "")
-        stage = row.get("stage_group", "")
-        line = row.get("line_of_therapy", "")
+    # The flag condition, including the back-calculation, is evaluated over
+    # whole columns; only the rows that raise a flag are visited. Rows with
+    # a zero target have no overrun to measure and get their own flag.
+    adherence_all = float_column(episodes_df, "pathway_adherence_rate", np.nan)
+    avg_cost_all = float_column(episodes_df, "avg_episode_cost", np.nan)
+    target_all = float_column(episodes_df, "target_price", np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        overrun_all = (avg_cost_all - target_all) / target_all
+        non_pathway_all = (avg_cost_all - adherence_all * target_all) / (1 - adherence_all)
+        diff_pct_all = np.where(target_all > 0, (non_pathway_all - target_all) / target_all, 0)
+        pathway_driven = ((adherence_all < 0.75) & (avg_cost_all > target_all)
+                          & ((target_all == 0) | ((overrun_all > 0.10) & (diff_pct_all > 0.25))))
+
+    for row in episodes_df.iloc[np.flatnonzero(pathway_driven)].itertuples(index=False, name="Episode"):
+        cancer = getattr(row, "cancer_type", "")
+        stage = getattr(row, "stage_group", "")
+        line = getattr(row, "line_of_therapy", "")
         ep_label = f"{cancer} {stage} {line}".strip()
-        adherence = row.get("pathway_adherence_rate")
-        avg_cost = row.get("avg_episode_cost")
-        target = row.get("target_price")
-
-        if (pd.notna(adherence) and pd.notna(avg_cost) and pd.notna(target)
-                and adherence < 0.75 and avg_cost > target):
-            cost_overrun_pct = (avg_cost - target) / target
-            if cost_overrun_pct > 0.10:
-                # Back-calculate pathway vs non-pathway cost
-                # avg_cost = adherence * pathway_cost + (1 - adherence) * non_pathway_cost
-                # We know for NSCLC 1L: pathway ~107,000, non-pathway ~142,000
-                # Estimate: pathway_cost ≈ target (conservative)
-                pathway_cost_est = target
-                if adherence < 1.0:
-                    non_pathway_cost_est = (avg_cost - adherence * pathway_cost_est) / (1 - adherence)
-                    cost_diff = non_pathway_cost_est - pathway_cost_est
-                    cost_diff_pct = cost_diff / pathway_cost_est if pathway_cost_est > 0 else 0
-
-                    if cost_diff_pct > 0.25:
-                        flags.append(ValidationFlag(
-                            flag_id=_next_id(), severity="RED", category="cross_metric",
-                            metric_name="pathway_cost_correlation",
-                            metric_value=f"adherence={adherence:.0%}, cost overrun={cost_overrun_pct:.1%}",
-                            expected_value="Pathway adherence >75% when cost exceeds target by >10%",
-                            episode_type=ep_label, contract_id=contract_id,
-                            description=f"{ep_label}: Cost overrun of {cost_overrun_pct:.1%} correlated "
-                                        f"with pathway adherence of only {adherence:.0%}",
-                            detail=f"Back-calculation: pathway cases cost ~${pathway_cost_est:,.0f}, "
-                                   f"non-pathway cases cost ~${non_pathway_cost_est:,.0f} "
-                                   f"(+{cost_diff_pct:.0%}). "
-                                   f"Verification: ({adherence:.0%} x ${pathway_cost_est:,.0f}) + "
-                                   f"({1-adherence:.0%} x ${non_pathway_cost_est:,.0f}) = "
-                                   f"${adherence * pathway_cost_est + (1-adherence) * non_pathway_cost_est:,.0f} "
-                                   f"≈ ${avg_cost:,.0f}. Non-pathway regimens are the primary cost driver.",
-                            related_metrics={
-                                "avg_episode_cost": avg_cost,
-                                "target_price": target,
-                                "pathway_adherence": adherence,
-                                "est_pathway_cost": pathway_cost_est,
-                                "est_non_pathway_cost": round(non_pathway_cost_est),
-                            },
-                        ))
+        adherence = row.pathway_adherence_rate
+        avg_cost = row.avg_episode_cost
+        target = row.target_price
+
+        if target == 0:
+            flags.append(ValidationFlag(
+                flag_id=_next_id(), severity="RED", category="cross_metric",
+                metric_name="pathway_cost_correlation",
+                metric_value=f"adherence={adherence:.0%}, target=$0",
+                expected_value="Positive target price",
+                episode_type=ep_label, contract_id=contract_id,
+                description=f"{ep_label}: Target price is zero, so the cost overrun "
+                            f"behind pathway adherence of {adherence:.0%} cannot be measured",
+                detail=f"Average episode cost ${avg_cost:,.0f} against a $0 target. "
+                       f"Verify the target price before reviewing pathway adherence.",
+                related_metrics={
+                    "avg_episode_cost": avg_cost,
+                    "target_price": target,
+                    "pathway_adherence": adherence,
+                },
+            ))
+            continue
+
+        cost_overrun_pct = (avg_cost - target) / target
+        # Back-calculate pathway vs non-pathway cost
+        # avg_cost = adherence * pathway_cost + (1 - adherence) * non_pathway_cost
+        # We know for NSCLC 1L: pathway ~107,000, non-pathway ~142,000
+        # Estimate: pathway_cost ≈ target (conservative)
+        pathway_cost_est = target
+        non_pathway_cost_est = (avg_cost - adherence * pathway_cost_est) / (1 - adherence)
+        cost_diff = non_pathway_cost_est - pathway_cost_est
+        cost_diff_pct = cost_diff / pathway_cost_est
+
+        flags.append(ValidationFlag(
+            flag_id=_next_id(), severity="RED", category="cross_metric",
+            metric_name="pathway_cost_correlation",
+            metric_value=f"adherence={adherence:.0%}, cost overrun={cost_overrun_pct:.1%}",
+            expected_value="Pathway adherence >75% when cost exceeds target by >10%",
+            episode_type=ep_label, contract_id=contract_id,
+            description=f"{ep_label}: Cost overrun of {cost_overrun_pct:.1%} correlated "
+                        f"with pathway adherence of only {adherence:.0%}",
+            detail=f"Back-calculation: pathway cases cost ~${pathway_cost_est:,.0f}, "
+                   f"non-pathway cases cost ~${non_pathway_cost_est:,.0f} "
+                   f"(+{cost_diff_pct:.0%}). "
+                   f"Verification: ({adherence:.0%} x ${pathway_cost_est:,.0f}) + "
+                   f"({1-adherence:.0%} x ${non_pathway_cost_est:,.0f}) = "
+                   f"${adherence * pathway_cost_est + (1-adherence) * non_pathway_cost_est:,.0f} "
+                   f"≈ ${avg_cost:,.0f}. Non-pathway regimens are the primary cost driver.",
+            related_metrics={
+                "avg_episode_cost": avg_cost,
+                "target_price": target,
+                "pathway_adherence": adherence,
+                "est_pathway_cost": pathway_cost_est,
+                "est_non_pathway_cost": round(non_pathway_cost_est),
+            },
+        ))
 
     # 4. EOL metric clustering
-    quality_no_comp = quality_df[~quality_df["measure_id"].str.contains("COMP", na=False)]
-    eol_measures = {
-        "ONC-Q-002": ("Chemo Within 14 Days of Death", "high_is_bad"),
-        "ONC-Q-003": ("Hospice Enrollment", "low_is_bad"),
-        "ONC-Q-004": ("Hospice >7 Days Before Death", "low_is_bad"),
-        "ONC-Q-005": ("ICU Within 30 Days of Death", "high_is_bad"),
-        "ONC-Q-006": ("ER Within 30 Days of Death", "high_is_bad"),
-    }
-
-    eol_failures = 0
-    eol_details = []
-    for _, row in quality_no_comp.iterrows():
-        mid = row.get("measure_id", "")
-        if mid in eol_measures:
-            rate = row.get("rate", 0)
-            target = row.get("target", 0)
-            name, direction = eol_measures[mid]
-            if pd.notna(rate) and pd.notna(target):
-                if direction == "high_is_bad" and rate > target:
-                    eol_failures += 1
-                    eol_details.append(f"{name}: {rate:.1%} (target <{target:.0%})")
-                elif direction == "low_is_bad" and rate < target:
-                    eol_failures += 1
-                    eol_details.append(f"{name}: {rate:.1%} (target >{target:.0%})")
+    # Composite mask is computed once and shared with the quality gate check
+    is_comp = quality_df["measure_id"].str.contains("COMP", na=False, regex=False).to_numpy(dtype=bool)
+    quality_no_comp = quality_df[~is_comp]
+    # Inner merge keeps quality_no_comp's row order
+    eol = quality_no_comp.merge(EOL_MEASURES, on="measure_id", how="inner")
+    rates = float_column(eol, "rate", 0)
+    targets = float_column(eol, "target", 0)
+    high_is_bad = (eol["eol_direction"] == "high_is_bad").to_numpy(dtype=bool)
+    failing = (~np.isnan(rates) & ~np.isnan(targets)
+               & np.where(high_is_bad, rates > targets, rates < targets))
+
+    failures = eol.iloc[np.flatnonzero(failing)]
+    eol_failures = len(failures)
+    eol_details = [
+        f"{row.eol_name}: {getattr(row, 'rate', 0):.1%} "
+        f"(target {'<' if row.eol_direction == 'high_is_bad' else '>'}{getattr(row, 'target', 0):.0%})"
+        for row in failures.itertuples(index=False, name="Measure")
+    ]
 
     if eol_failures >= 3:
         # Check advance care planning
-        acp_row = quality_no_comp[quality_no_comp["measure_id"] == "ONC-Q-009"]
-        acp_rate = acp_row.iloc[0]["rate"] if len(acp_row) > 0 else None
+        acp_pos = first_positions(quality_no_comp["measure_id"]).get("ONC-Q-009")
+        acp_rate = quality_no_comp["rate"].to_numpy()[acp_pos] if acp_pos is not None else None
         acp_note = ""
         if pd.notna(acp_rate) and acp_rate < 0.50:
             acp_note = (f" Advance Care Planning documentation is only {acp_rate:.1%} "
@@ -304,10 +353,11 @@ def _check_onc_cross_metrics(episodes_df, quality_df, contract, onc_drugs_df=Non
         ))
 
     # 7. Quality gate proximity
-    comp_row = quality_df[quality_df["measure_id"].str.contains("COMP", na=False)]
-    if len(comp_row) > 0:
-        earned = comp_row.iloc[0].get("points_earned", 0)
-        max_pts = comp_row.iloc[0].get("max_points", 0)
+    comp_positions = np.flatnonzero(is_comp)
+    if len(comp_positions) > 0:
+        comp_pos = comp_positions[0]
+        earned = value_at(quality_df, "points_earned", comp_pos, 0)
+        max_pts = value_at(quality_df, "max_points", comp_pos, 0)
         gate_min = contract.get("quality_gate_minimum", 0)
 
         if pd.notna(earned) and pd.notna(max_pts) and max_pts > 0:
@@ -316,12 +366,9 @@ def _check_onc_cross_metrics(episodes_df, quality_df, contract, onc_drugs_df=Non
 
             if 0 < gap <= 5:
                 # Near miss — identify cheapest path to passing
-                total_savings = 0
-                for _, row in episodes_df.iterrows():
-                    tc = row.get("total_cost", 0)
-                    tt = row.get("total_target", 0)
-                    if pd.notna(tc) and pd.notna(tt):
-                        total_savings += (tt - tc)
+                # Rows missing either total give NaN and are skipped by nansum
+                total_savings = np.nansum(float_column(episodes_df, "total_target", 0)
+                                          - float_column(episodes_df, "total_cost", 0))
 
                 sharing_rate = contract.get("sharing_rate_savings", 0)
                 at_risk = max(0, total_savings) * sharing_rate
@@ -360,36 +407,37 @@ def _check_onc_cross_metrics(episodes_df, quality_df, contract, onc_drugs_df=Non
 
     # 8. Biosimilar x site-of-service compounding
     if onc_drugs_df is not None:
-        for _, drug in onc_drugs_df.iterrows():
-            name = drug.get("drug_name", "")
-            avg_cost = drug.get("avg_cost_per_claim", 0)
-            hopd_pct = drug.get("site_of_service_hopd_pct", 0)
-            is_bio = drug.get("is_biosimilar", False)
-
-            if pd.notna(avg_cost) and avg_cost > 2000 and pd.notna(hopd_pct) and hopd_pct > 0.60:
-                if not is_bio and str(is_bio).lower() != 'true':
-                    total_claims = drug.get("total_claims", 0)
-                    # Estimate savings from site-of-service shift
-                    excess_hopd_claims = total_claims * (hopd_pct - 0.40)
-                    # HOPD costs ~2x office — estimate savings
-                    est_savings = excess_hopd_claims * avg_cost * 0.30  # rough 30% facility markup
-
-                    flags.append(ValidationFlag(
-                        flag_id=_next_id(), severity="YELLOW", category="cross_metric",
-                        metric_name="site_of_service_cost",
-                        metric_value=f"{name}: {hopd_pct:.0%} HOPD, ${avg_cost:,.0f}/claim",
-                        expected_value="HOPD <60% for office-administrable drugs",
-                        episode_type="Drug Detail", contract_id=contract_id,
-                        description=f"{name}: {hopd_pct:.0%} HOPD administration for a "
-                                    f"drug costing ${avg_cost:,.0f}/claim — estimated "
-                                    f"${est_savings:,.0f} in excess facility costs",
-                        detail=f"This drug is being administered primarily in hospital "
-                               f"outpatient settings ({hopd_pct:.0%}) when it could be safely "
-                               f"given in physician offices. HOPD infusion costs 2-3x office "
-                               f"administration in facility fees.",
-                        related_metrics={"drug_name": name, "hopd_pct": hopd_pct,
-                                         "avg_cost_per_claim": avg_cost,
-                                         "total_claims": total_claims},
-                    ))
+        # Costly originator drugs given mostly in HOPD; only those rows are visited
+        high_cost_hopd = ((float_column(onc_drugs_df, "avg_cost_per_claim", 0) > 2000)
+                          & (float_column(onc_drugs_df, "site_of_service_hopd_pct", 0) > 0.60)
+                          & ~_truthy(onc_drugs_df, "is_biosimilar"))
+
+        for drug in onc_drugs_df.iloc[np.flatnonzero(high_cost_hopd)].itertuples(index=False, name="Drug"):
+            name = getattr(drug, "drug_name", "")
+            avg_cost = drug.avg_cost_per_claim
+            hopd_pct = drug.site_of_service_hopd_pct
+            total_claims = getattr(drug, "total_claims", 0)
+            # Estimate savings from site-of-service shift
+            excess_hopd_claims = total_claims * (hopd_pct - 0.40)
+            # HOPD costs ~2x office — estimate savings
+            est_savings = excess_hopd_claims * avg_cost * 0.30  # rough 30% facility markup
+
+            flags.append(ValidationFlag(
+                flag_id=_next_id(), severity="YELLOW", category="cross_metric",
+                metric_name="site_of_service_cost",
+                metric_value=f"{name}: {hopd_pct:.0%} HOPD, ${avg_cost:,.0f}/claim",
+                expected_value="HOPD <60% for office-administrable drugs",
+                episode_type="Drug Detail", contract_id=contract_id,
+                description=f"{name}: {hopd_pct:.0%} HOPD administration for a "
+                            f"drug costing ${avg_cost:,.0f}/claim — estimated "
+                            f"${est_savings:,.0f} in excess facility costs",
+                detail=f"This drug is being administered primarily in hospital "
+                       f"outpatient settings ({hopd_pct:.0%}) when it could be safely "
+                       f"given in physician offices. HOPD infusion costs 2-3x office "
+                       f"administration in facility fees.",
+                related_metrics={"drug_name": name, "hopd_pct": hopd_pct,
+                                 "avg_cost_per_claim": avg_cost,
+                                 "total_claims": total_claims},
+            ))
 
     return flags
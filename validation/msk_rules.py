@@ -3,14 +3,12 @@
 import pandas as pd
 import numpy as np
 from validation import ValidationFlag
+from validation._frame_utils import (
+    episode_types, first_positions, flag_id_sequence, float_column, value_at,
+)
 
-_msk_counter = 0
 
-
-def _next_id():
-    global _msk_counter
-    _msk_counter += 1
-    return f"MSK-{_msk_counter:03d}"
+_next_id = flag_id_sequence("MSK")
 
 
 # Implant cost ratio benchmarks by procedure category
@@ -23,6 +21,11 @@ IMPLANT_RATIO_BENCHMARKS = {
     "Knee Arthroscopy": {"max_ratio": 0.10, "category": "arthroscopy"},
 }
 
+# The same benchmarks flattened to one dict per field, for Series.map and
+# single lookups
+_MAX_RATIO = {ep: benchmark["max_ratio"] for ep, benchmark in IMPLANT_RATIO_BENCHMARKS.items()}
+_BENCHMARK_CATEGORY = {ep: benchmark["category"] for ep, benchmark in IMPLANT_RATIO_BENCHMARKS.items()}
+
 
 def validate_msk_rules(episodes_df: pd.DataFrame, quality_df: pd.DataFrame,
                        reference_ranges: dict, contract: dict) -> list[ValidationFlag]:
@@ -31,52 +34,63 @@ def validate_msk_rules(episodes_df: pd.DataFrame, quality_df: pd.DataFrame,
     contract_id = contract["contract_id"]
     attributed_members = contract.get("attributed_members", 0)
 
-    # 1. Implant cost ratio
-    for _, row in episodes_df.iterrows():
-        ep_type = row.get("episode_type", "")
-        if ep_type not in IMPLANT_RATIO_BENCHMARKS:
-            continue
-
-        implant_cost = row.get("implant_cost_avg")
-        avg_cost = row.get("avg_episode_cost")
-        if pd.isna(implant_cost) or pd.isna(avg_cost) or avg_cost == 0:
-            continue
+    # Pull every column the row rules need once; each rule below is a mask
+    # over these arrays, and only the rows it flags are visited.
+    ep_types = episode_types(episodes_df)
+    avg_costs = float_column(episodes_df, "avg_episode_cost", np.nan)
+    implant_costs = float_column(episodes_df, "implant_cost_avg", np.nan)
+    post_acute_costs = float_column(episodes_df, "post_acute_cost_avg", np.nan)
+    mmes = float_column(episodes_df, "avg_opioid_mme_discharge", np.nan)
+    prom_rates = float_column(episodes_df, "prom_collection_rate", np.nan)
+    # Opioid and PROM checks apply to surgical episodes only
+    surgical = ~ep_types.astype(str).str.contains(
+        "Conservative", na=False, regex=False).to_numpy(dtype=bool)
 
+    # 1. Implant cost ratio
+    max_ratios = ep_types.map(_MAX_RATIO).to_numpy(dtype=np.float64, na_value=np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        over_benchmark = (avg_costs != 0) & (implant_costs / avg_costs > max_ratios)
+
+    for row in episodes_df.iloc[np.flatnonzero(over_benchmark)].itertuples(index=False, name="Episode"):
+        ep_type = row.episode_type
+        implant_cost = row.implant_cost_avg
+        avg_cost = row.avg_episode_cost
         ratio = implant_cost / avg_cost
-        benchmark = IMPLANT_RATIO_BENCHMARKS[ep_type]
-        max_ratio = benchmark["max_ratio"]
-
-        if ratio > max_ratio:
-            flags.append(ValidationFlag(
-                flag_id=_next_id(), severity="RED", category="specialty",
-                metric_name="implant_cost_ratio",
-                metric_value=f"{ratio:.1%}",
-                expected_value=f"<{max_ratio:.0%} for {benchmark['category']}",
-                episode_type=ep_type, contract_id=contract_id,
-                description=f"{ep_type}: Implant cost is {ratio:.1%} of total episode cost "
-                            f"(${implant_cost:,.0f}/${avg_cost:,.0f}), exceeding "
-                            f"{max_ratio:.0%} benchmark",
-                detail=f"Implant cost avg ${implant_cost:,.0f} represents {ratio:.1%} of "
-                       f"total episode cost ${avg_cost:,.0f}. Industry benchmark for "
-                       f"{benchmark['category']} is <{max_ratio:.0%}. This may indicate "
-                       f"premium device selection or unfavorable vendor pricing. "
-                       f"Note: risk score actual ({row.get('risk_score_actual', 'N/A')}) vs "
-                       f"expected ({row.get('risk_score_expected', 'N/A')}) shows the overrun "
-                       f"is NOT explained by case complexity.",
-                related_metrics={
-                    "implant_cost_avg": implant_cost,
-                    "avg_episode_cost": avg_cost,
-                    "implant_ratio": round(ratio, 4),
-                    "benchmark_max": max_ratio,
-                    "risk_score_actual": row.get("risk_score_actual"),
-                    "risk_score_expected": row.get("risk_score_expected"),
-                },
-            ))
+        max_ratio = _MAX_RATIO[ep_type]
+        category = _BENCHMARK_CATEGORY[ep_type]
+
+        flags.append(ValidationFlag(
+            flag_id=_next_id(), severity="RED", category="specialty",
+            metric_name="implant_cost_ratio",
+            metric_value=f"{ratio:.1%}",
+            expected_value=f"<{max_ratio:.0%} for {category}",
+            episode_type=ep_type, contract_id=contract_id,
+            description=f"{ep_type}: Implant cost is {ratio:.1%} of total episode cost "
+                        f"(${implant_cost:,.0f}/${avg_cost:,.0f}), exceeding "
+                        f"{max_ratio:.0%} benchmark",
+            detail=f"Implant cost avg ${implant_cost:,.0f} represents {ratio:.1%} of "
+                   f"total episode cost ${avg_cost:,.0f}. Industry benchmark for "
+                   f"{category} is <{max_ratio:.0%}. This may indicate "
+                   f"premium device selection or unfavorable vendor pricing. "
+                   f"Note: risk score actual ({getattr(row, 'risk_score_actual', 'N/A')}) vs "
+                   f"expected ({getattr(row, 'risk_score_expected', 'N/A')}) shows the overrun "
+                   f"is NOT explained by case complexity.",
+            related_metrics={
+                "implant_cost_avg": implant_cost,
+                "avg_episode_cost": avg_cost,
+                "implant_ratio": round(ratio, 4),
+                "benchmark_max": max_ratio,
+                "risk_score_actual": getattr(row, "risk_score_actual", None),
+                "risk_score_expected": getattr(row, "risk_score_expected", None),
+            },
+        ))
 
     # 2. Arthroscopy volume reasonableness
-    arth_row = episodes_df[episodes_df["episode_type"] == "Knee Arthroscopy"]
-    if len(arth_row) > 0 and attributed_members > 0:
-        arth_count = arth_row.iloc[0].get("episode_count", 0)
+    # Rules 2 and 7 each read one row per episode type; find those rows once.
+    first_row = first_positions(episodes_df["episode_type"])
+    arth_pos = first_row.get("Knee Arthroscopy")
+    if arth_pos is not None and attributed_members > 0:
+        arth_count = value_at(episodes_df, "episode_count", arth_pos, 0)
         rate_per_1000 = arth_count / (attributed_members / 1000)
         if rate_per_1000 > 25:
             flags.append(ValidationFlag(
@@ -102,90 +116,85 @@ def validate_msk_rules(episodes_df: pd.DataFrame, quality_df: pd.DataFrame,
     # Already covered in cross_metric.py — skip to avoid duplicate
 
     # 4. Post-acute cost efficiency
-    for _, row in episodes_df.iterrows():
-        ep_type = row.get("episode_type", "")
-        if ep_type not in ("TKR", "THR"):
-            continue
-
-        post_acute = row.get("post_acute_cost_avg")
-        avg_cost = row.get("avg_episode_cost")
-        if pd.isna(post_acute) or pd.isna(avg_cost) or avg_cost == 0:
-            continue
-
+    is_joint_replacement = ep_types.isin(("TKR", "THR")).to_numpy(dtype=bool)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        high_post_acute = (is_joint_replacement & (avg_costs != 0)
+                           & (post_acute_costs / avg_costs > 0.20))
+
+    for row in episodes_df.iloc[np.flatnonzero(high_post_acute)].itertuples(index=False, name="Episode"):
+        ep_type = row.episode_type
+        post_acute = row.post_acute_cost_avg
+        avg_cost = row.avg_episode_cost
         pa_ratio = post_acute / avg_cost
-        if pa_ratio > 0.20:
-            flags.append(ValidationFlag(
-                flag_id=_next_id(), severity="YELLOW", category="specialty",
-                metric_name="post_acute_cost_ratio",
-                metric_value=f"{pa_ratio:.1%}",
-                expected_value="<20% of total episode cost",
-                episode_type=ep_type, contract_id=contract_id,
-                description=f"{ep_type}: Post-acute costs are {pa_ratio:.1%} of total "
-                            f"episode cost (${post_acute:,.0f}/${avg_cost:,.0f})",
-                detail=f"Post-acute spending (SNF, IRF, home health) at {pa_ratio:.1%} of "
-                       f"total episode cost exceeds the 20% benchmark. Consider "
-                       f"care coordination improvements and discharge planning optimization.",
-                related_metrics={"post_acute_cost_avg": post_acute,
-                                 "avg_episode_cost": avg_cost,
-                                 "discharge_home_pct": row.get("discharge_home_pct"),
-                                 "discharge_snf_pct": row.get("discharge_snf_pct")},
-            ))
+        flags.append(ValidationFlag(
+            flag_id=_next_id(), severity="YELLOW", category="specialty",
+            metric_name="post_acute_cost_ratio",
+            metric_value=f"{pa_ratio:.1%}",
+            expected_value="<20% of total episode cost",
+            episode_type=ep_type, contract_id=contract_id,
+            description=f"{ep_type}: Post-acute costs are {pa_ratio:.1%} of total "
+                        f"episode cost (${post_acute:,.0f}/${avg_cost:,.0f})",
+            detail=f"Post-acute spending (SNF, IRF, home health) at {pa_ratio:.1%} of "
+                   f"total episode cost exceeds the 20% benchmark. Consider "
+                   f"care coordination improvements and discharge planning optimization.",
+            related_metrics={"post_acute_cost_avg": post_acute,
+                             "avg_episode_cost": avg_cost,
+                             "discharge_home_pct": getattr(row, "discharge_home_pct", None),
+                             "discharge_snf_pct": getattr(row, "discharge_snf_pct", None)},
+        ))
 
     # 5. Opioid prescribing
-    for _, row in episodes_df.iterrows():
-        ep_type = row.get("episode_type", "")
-        if "Conservative" in str(ep_type):
-            continue
-        mme = row.get("avg_opioid_mme_discharge")
-        if pd.notna(mme) and mme > 50:
-            severity = "RED" if mme > 90 else "YELLOW"
-            flags.append(ValidationFlag(
-                flag_id=_next_id(), severity=severity, category="specialty",
-                metric_name="opioid_mme_discharge",
-                metric_value=f"{mme} MME",
-                expected_value="<50 MME (CDC guideline-informed)",
-                episode_type=ep_type, contract_id=contract_id,
-                description=f"{ep_type}: Average discharge opioid prescription of {mme} MME "
-                            f"exceeds 50 MME threshold",
-                detail=f"CDC-informed guidelines suggest discharge opioid prescriptions "
-                       f"should average <50 MME. Current average of {mme} MME for {ep_type} "
-                       f"may indicate opportunity for enhanced recovery protocols or "
-                       f"multimodal pain management.",
-                related_metrics={"avg_opioid_mme_discharge": mme},
-            ))
+    high_mme = np.flatnonzero(surgical & (mmes > 50))
+    severities = np.where(mmes[high_mme] > 90, "RED", "YELLOW").tolist()
+    for row, severity in zip(episodes_df.iloc[high_mme].itertuples(index=False, name="Episode"),
+                             severities):
+        ep_type = getattr(row, "episode_type", "")
+        mme = row.avg_opioid_mme_discharge
+        flags.append(ValidationFlag(
+            flag_id=_next_id(), severity=severity, category="specialty",
+            metric_name="opioid_mme_discharge",
+            metric_value=f"{mme} MME",
+            expected_value="<50 MME (CDC guideline-informed)",
+            episode_type=ep_type, contract_id=contract_id,
+            description=f"{ep_type}: Average discharge opioid prescription of {mme} MME "
+                        f"exceeds 50 MME threshold",
+            detail=f"CDC-informed guidelines suggest discharge opioid prescriptions "
+                   f"should average <50 MME. Current average of {mme} MME for {ep_type} "
+                   f"may indicate opportunity for enhanced recovery protocols or "
+                   f"multimodal pain management.",
+            related_metrics={"avg_opioid_mme_discharge": mme},
+        ))
 
     # 6. PROM reliability
-    for _, row in episodes_df.iterrows():
-        ep_type = row.get("episode_type", "")
-        if "Conservative" in str(ep_type):
-            continue
-        prom_coll = row.get("prom_collection_rate")
-        prom_improve = row.get("prom_improvement_rate")
-        if pd.notna(prom_coll) and prom_coll < 0.50:
-            flags.append(ValidationFlag(
-                flag_id=_next_id(), severity="RED", category="specialty",
-                metric_name="prom_collection_reliability",
-                metric_value=f"{prom_coll:.0%} collection rate",
-                expected_value=">50% for reliable outcome measurement",
-                episode_type=ep_type, contract_id=contract_id,
-                description=f"{ep_type}: PROM collection rate of {prom_coll:.0%} renders "
-                            f"outcome measures unreliable",
-                detail=f"With only {prom_coll:.0%} PROM collection, the reported improvement "
-                       f"rate of {prom_improve:.1%} is measured on a biased sample. Compliant "
-                       f"patients who return PROMs likely have better outcomes than "
-                       f"non-responders. This is an operational/data capture problem, not a "
-                       f"care quality problem — the provider lacks a systematic PROM "
-                       f"collection workflow.",
-                related_metrics={"prom_collection_rate": prom_coll,
-                                 "prom_improvement_rate": prom_improve},
-            ))
+    low_prom = surgical & (prom_rates < 0.50)
+    for row in episodes_df.iloc[np.flatnonzero(low_prom)].itertuples(index=False, name="Episode"):
+        ep_type = getattr(row, "episode_type", "")
+        prom_coll = row.prom_collection_rate
+        prom_improve = getattr(row, "prom_improvement_rate", None)
+        flags.append(ValidationFlag(
+            flag_id=_next_id(), severity="RED", category="specialty",
+            metric_name="prom_collection_reliability",
+            metric_value=f"{prom_coll:.0%} collection rate",
+            expected_value=">50% for reliable outcome measurement",
+            episode_type=ep_type, contract_id=contract_id,
+            description=f"{ep_type}: PROM collection rate of {prom_coll:.0%} renders "
+                        f"outcome measures unreliable",
+            detail=f"With only {prom_coll:.0%} PROM collection, the reported improvement "
+                   f"rate of {prom_improve:.1%} is measured on a biased sample. Compliant "
+                   f"patients who return PROMs likely have better outcomes than "
+                   f"non-responders. This is an operational/data capture problem, not a "
+                   f"care quality problem — the provider lacks a systematic PROM "
+                   f"collection workflow.",
+            related_metrics={"prom_collection_rate": prom_coll,
+                             "prom_improvement_rate": prom_improve},
+        ))
 
     # 7. Spinal fusion level distribution
-    fus_12 = episodes_df[episodes_df["episode_type"] == "Spinal Fusion 1-2"]
-    fus_3p = episodes_df[episodes_df["episode_type"] == "Spinal Fusion 3+"]
-    if len(fus_12) > 0 and len(fus_3p) > 0:
-        count_12 = fus_12.iloc[0].get("episode_count", 0)
-        count_3p = fus_3p.iloc[0].get("episode_count", 0)
+    fus_12_pos = first_row.get("Spinal Fusion 1-2")
+    fus_3p_pos = first_row.get("Spinal Fusion 3+")
+    if fus_12_pos is not None and fus_3p_pos is not None:
+        count_12 = value_at(episodes_df, "episode_count", fus_12_pos, 0)
+        count_3p = value_at(episodes_df, "episode_count", fus_3p_pos, 0)
         total_fusions = count_12 + count_3p
         if total_fusions > 0:
             pct_3p = count_3p / total_fusions
@@ -5,14 +5,17 @@ import numpy as np
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
 from validation import ValidationFlag
+from validation._frame_utils import first_positions, flag_id_sequence, float_column, value_at
 
-_onc_counter = 0
 
+_next_id = flag_id_sequence("ONC")
 
-def _next_id():
-    global _onc_counter
-    _onc_counter += 1
-    return f"ONC-{_onc_counter:03d}"
+
+def _is_true(values: pd.Series) -> np.ndarray:
+    """Which values read as "true" in any case; bool columns are used as-is."""
+    if values.dtype == bool:
+        return values.to_numpy()
+    return values.astype(str).str.lower().eq("true").to_numpy(dtype=bool)
 
 
 # Biosimilar pair definitions: (brand_keyword, biosimilar_keyword)
@@ -56,59 +59,84 @@ def _rule_pathway_adherence_cost(episodes_df, contract):
     contract_id = contract["contract_id"]
     pathway_target = contract.get("pathway_adherence_target", 0.80)
 
-    for _, row in episodes_df.iterrows():
-        ep_label = f"{row.get('cancer_type', '')} {row.get('stage_group', '')} {row.get('line_of_therapy', '')}".strip()
-        adherence = row.get("pathway_adherence_rate")
-        avg_cost = row.get("avg_episode_cost")
-        target = row.get("target_price")
-
-        if pd.isna(adherence) or pd.isna(avg_cost) or pd.isna(target):
-            continue
-        if adherence >= pathway_target or avg_cost <= target:
+    # The whole flag condition, back-calculation included, is evaluated over
+    # columns; only flagged rows are visited. Rows with a zero target have no
+    # overrun to measure and get their own flag.
+    adherence_all = float_column(episodes_df, "pathway_adherence_rate", np.nan)
+    avg_cost_all = float_column(episodes_df, "avg_episode_cost", np.nan)
+    target_all = float_column(episodes_df, "target_price", np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        overrun_all = (avg_cost_all - target_all) / target_all
+        non_pathway_all = (avg_cost_all - adherence_all * target_all) / (1 - adherence_all)
+        diff_pct_all = np.where(target_all > 0, (non_pathway_all - target_all) / target_all, 0)
+        flagged = ((adherence_all < pathway_target) & (avg_cost_all > target_all)
+                   & ((target_all == 0)
+                      | ((overrun_all > 0.05) & (adherence_all < 1.0) & (diff_pct_all > 0.25))))
+
+    for row in episodes_df.iloc[np.flatnonzero(flagged)].itertuples(index=False, name="Episode"):
+        ep_label = (f"{getattr(row, 'cancer_type', '')} {getattr(row, 'stage_group', '')} "
+                    f"{getattr(row, 'line_of_therapy', '')}").strip()
+        adherence = row.pathway_adherence_rate
+        avg_cost = row.avg_episode_cost
+        target = row.target_price
+
+        if target == 0:
+            flags.append(ValidationFlag(
+                flag_id=_next_id(), severity="RED", category="specialty",
+                metric_name="pathway_cost_correlation",
+                metric_value=f"adherence={adherence:.0%}, target=$0",
+                expected_value="Positive target price",
+                episode_type=ep_label, contract_id=contract_id,
+                description=f"{ep_label}: Target price is zero, so the cost of "
+                            f"pathway adherence at {adherence:.0%} cannot be measured",
+                detail=f"Average episode cost ${avg_cost:,.0f} against a $0 target. "
+                       f"Verify the target price before estimating non-pathway cost.",
+                related_metrics={
+                    "pathway_adherence": adherence,
+                    "avg_episode_cost": avg_cost,
+                    "target_price": target,
+                },
+            ))
             continue
 
         cost_overrun_pct = (avg_cost - target) / target
-        if cost_overrun_pct <= 0.05:
-            continue
 
         # Back-calculate: avg_cost = adherence * pathway_cost + (1-adherence) * non_pathway_cost
         pathway_cost_est = target
-        if adherence < 1.0:
-            non_pathway_cost_est = (avg_cost - adherence * pathway_cost_est) / (1 - adherence)
-            cost_diff = non_pathway_cost_est - pathway_cost_est
-            cost_diff_pct = cost_diff / pathway_cost_est if pathway_cost_est > 0 else 0
-
-            if cost_diff_pct > 0.25:
-                episode_count = row.get("episode_count", 0)
-                non_pathway_count = int(episode_count * (1 - adherence))
-                potential_savings = non_pathway_count * cost_diff
-
-                flags.append(ValidationFlag(
-                    flag_id=_next_id(), severity="RED", category="specialty",
-                    metric_name="pathway_cost_correlation",
-                    metric_value=f"adherence={adherence:.0%}, overrun={cost_overrun_pct:.1%}",
-                    expected_value=f"pathway adherence >{pathway_target:.0%}",
-                    episode_type=ep_label, contract_id=contract_id,
-                    description=f"{ep_label}: Non-pathway regimens cost "
-                                f"${non_pathway_cost_est:,.0f}/episode vs "
-                                f"${pathway_cost_est:,.0f} pathway (+{cost_diff_pct:.0%}), "
-                                f"driving ${potential_savings:,.0f} in excess cost",
-                    detail=f"Back-calculation: ({adherence:.0%} x ${pathway_cost_est:,.0f}) + "
-                           f"({1-adherence:.0%} x ${non_pathway_cost_est:,.0f}) = "
-                           f"${adherence * pathway_cost_est + (1-adherence) * non_pathway_cost_est:,.0f} "
-                           f"≈ ${avg_cost:,.0f}. The {1-adherence:.0%} non-pathway cases ({non_pathway_count} "
-                           f"episodes) are the primary cost driver. Improving pathway adherence to "
-                           f"{pathway_target:.0%} would save approximately "
-                           f"${potential_savings:,.0f} across this episode type.",
-                    related_metrics={
-                        "pathway_adherence": adherence,
-                        "avg_episode_cost": avg_cost,
-                        "target_price": target,
-                        "est_pathway_cost": pathway_cost_est,
-                        "est_non_pathway_cost": round(non_pathway_cost_est),
-                        "potential_savings": round(potential_savings),
-                    },
-                ))
+        non_pathway_cost_est = (avg_cost - adherence * pathway_cost_est) / (1 - adherence)
+        cost_diff = non_pathway_cost_est - pathway_cost_est
+        cost_diff_pct = cost_diff / pathway_cost_est
+
+        episode_count = getattr(row, "episode_count", 0)
+        non_pathway_count = int(episode_count * (1 - adherence))
+        potential_savings = non_pathway_count * cost_diff
+
+        flags.append(ValidationFlag(
+            flag_id=_next_id(), severity="RED", category="specialty",
+            metric_name="pathway_cost_correlation",
+            metric_value=f"adherence={adherence:.0%}, overrun={cost_overrun_pct:.1%}",
+            expected_value=f"pathway adherence >{pathway_target:.0%}",
+            episode_type=ep_label, contract_id=contract_id,
+            description=f"{ep_label}: Non-pathway regimens cost "
+                        f"${non_pathway_cost_est:,.0f}/episode vs "
+                        f"${pathway_cost_est:,.0f} pathway (+{cost_diff_pct:.0%}), "
+                        f"driving ${potential_savings:,.0f} in excess cost",
+            detail=f"Back-calculation: ({adherence:.0%} x ${pathway_cost_est:,.0f}) + "
+                   f"({1-adherence:.0%} x ${non_pathway_cost_est:,.0f}) = "
+                   f"${adherence * pathway_cost_est + (1-adherence) * non_pathway_cost_est:,.0f} "
+                   f"≈ ${avg_cost:,.0f}. The {1-adherence:.0%} non-pathway cases ({non_pathway_count} "
+                   f"episodes) are the primary cost driver. Improving pathway adherence to "
+                   f"{pathway_target:.0%} would save approximately "
+                   f"${potential_savings:,.0f} across this episode type.",
+            related_metrics={
+                "pathway_adherence": adherence,
+                "avg_episode_cost": avg_cost,
+                "target_price": target,
+                "est_pathway_cost": pathway_cost_est,
+                "est_non_pathway_cost": round(non_pathway_cost_est),
+                "potential_savings": round(potential_savings),
+            },
+        ))
 
     return flags
 
@@ -119,19 +147,29 @@ def _rule_biosimilar_savings(drugs_df, episodes_df, contract):
     contract_id = contract["contract_id"]
     total_episodes = episodes_df["episode_count"].sum()
 
-    for brand_keyword, biosimilar_keyword in BIOSIMILAR_PAIRS:
-        brand_rows = drugs_df[drugs_df["drug_name"].str.contains(brand_keyword.split("(")[0].strip(), na=False)
-                              & ~drugs_df["is_biosimilar"].astype(str).str.lower().eq("true")]
-        bio_rows = drugs_df[drugs_df["drug_name"].str.contains(biosimilar_keyword, na=False)]
+    # is_biosimilar is normalized once for all pairs; each pair then only
+    # needs the positions of its first brand and biosimilar rows.
+    drug_names = drugs_df["drug_name"]
+    is_bio = _is_true(drugs_df["is_biosimilar"])
 
-        if len(brand_rows) == 0 or len(bio_rows) == 0:
+    for brand_keyword, biosimilar_keyword in BIOSIMILAR_PAIRS:
+        molecule = brand_keyword.split("(")[0].strip()
+        brand_matches = np.flatnonzero(
+            drug_names.str.contains(molecule, na=False, regex=False).to_numpy(dtype=bool)
+            & ~is_bio)
+        bio_matches = np.flatnonzero(
+            drug_names.str.contains(biosimilar_keyword, na=False, regex=False).to_numpy(dtype=bool))
+
+        if len(brand_matches) == 0 or len(bio_matches) == 0:
             continue
 
-        brand = brand_rows.iloc[0]
-        bio = bio_rows.iloc[0]
+        brand = brand_matches[0]
+        bio = bio_matches[0]
+        brand_name = value_at(drugs_df, "drug_name", brand, "")
+        bio_name = value_at(drugs_df, "drug_name", bio, "")
 
-        brand_claims = brand.get("total_claims", 0)
-        bio_claims = bio.get("total_claims", 0)
+        brand_claims = value_at(drugs_df, "total_claims", brand, 0)
+        bio_claims = value_at(drugs_df, "total_claims", bio, 0)
         total_claims = brand_claims + bio_claims
 
         if total_claims == 0:
@@ -141,8 +179,8 @@ def _rule_biosimilar_savings(drugs_df, episodes_df, contract):
         if brand_pct <= 0.50:
             continue
 
-        brand_cost = brand.get("avg_cost_per_claim", 0)
-        bio_cost = bio.get("avg_cost_per_claim", 0)
+        brand_cost = value_at(drugs_df, "avg_cost_per_claim", brand, 0)
+        bio_cost = value_at(drugs_df, "avg_cost_per_claim", bio, 0)
         cost_diff = brand_cost - bio_cost
         potential_savings = brand_claims * cost_diff
         per_episode = potential_savings / total_episodes if total_episodes > 0 else 0
@@ -152,22 +190,22 @@ def _rule_biosimilar_savings(drugs_df, episodes_df, contract):
         flags.append(ValidationFlag(
             flag_id=_next_id(), severity=severity, category="specialty",
             metric_name="biosimilar_savings_opportunity",
-            metric_value=f"{brand.get('drug_name', '')}: {brand_pct:.0%} brand utilization",
+            metric_value=f"{brand_name}: {brand_pct:.0%} brand utilization",
             expected_value="brand utilization <50%",
             episode_type="Drug Detail", contract_id=contract_id,
-            description=f"{brand.get('drug_name', '')}: {brand_claims} brand claims at "
+            description=f"{brand_name}: {brand_claims} brand claims at "
                         f"${brand_cost:,.0f}/claim vs biosimilar at ${bio_cost:,.0f}/claim — "
                         f"${potential_savings:,.0f} savings opportunity (${per_episode:,.0f}/episode)",
-            detail=f"Brand {brand.get('drug_name', '')} has {brand_claims} claims at "
-                   f"${brand_cost:,.0f}/claim. Biosimilar {bio.get('drug_name', '')} has "
+            detail=f"Brand {brand_name} has {brand_claims} claims at "
+                   f"${brand_cost:,.0f}/claim. Biosimilar {bio_name} has "
                    f"{bio_claims} claims at ${bio_cost:,.0f}/claim. Brand utilization is "
                    f"{brand_pct:.0%} ({brand_claims}/{total_claims}). If all brand claims "
                    f"switched to biosimilar, savings would be {brand_claims} x "
                    f"(${brand_cost:,.0f} - ${bio_cost:,.0f}) = ${potential_savings:,.0f}, "
                    f"or ${per_episode:,.0f} per episode across {total_episodes} total episodes.",
             related_metrics={
-                "brand_drug": brand.get("drug_name"),
-                "biosimilar_drug": bio.get("drug_name"),
+                "brand_drug": brand_name,
+                "biosimilar_drug": bio_name,
                 "brand_claims": brand_claims,
                 "biosimilar_claims": bio_claims,
                 "brand_cost_per_claim": brand_cost,
@@ -185,28 +223,30 @@ def _rule_site_of_service_savings(drugs_df, contract):
     flags = []
     contract_id = contract["contract_id"]
 
-    for _, drug in drugs_df.iterrows():
-        name = drug.get("drug_name", "")
-        avg_cost = drug.get("avg_cost_per_claim", 0)
-        hopd_pct = drug.get("site_of_service_hopd_pct", 0)
-        total_claims = drug.get("total_claims", 0)
-        is_bio = str(drug.get("is_biosimilar", False)).lower() == "true"
-
-        if pd.isna(avg_cost) or avg_cost <= 2000:
-            continue
-        if pd.isna(hopd_pct) or hopd_pct <= 0.60:
-            continue
+    target_hopd_pct = 0.40
+
+    # Screen every drug at once. Only a savings estimate below $5,000
+    # rules a drug out, so a NaN estimate (missing claims) still reaches
+    # the flag below, as it did in the row loop.
+    avg_costs = float_column(drugs_df, "avg_cost_per_claim", 0)
+    hopd_pcts = float_column(drugs_df, "site_of_service_hopd_pct", 0)
+    claims = float_column(drugs_df, "total_claims", 0)
+    # HOPD costs ~2x office; facility fee markup is roughly 50% of drug cost
+    with np.errstate(invalid="ignore"):
+        est_savings_all = claims * (hopd_pcts - target_hopd_pct) * avg_costs * 0.50
+    candidates = (avg_costs > 2000) & (hopd_pcts > 0.60) & ~(est_savings_all < 5000)
+
+    for drug in drugs_df.iloc[np.flatnonzero(candidates)].itertuples(index=False, name="Drug"):
+        name = getattr(drug, "drug_name", "")
+        avg_cost = drug.avg_cost_per_claim
+        hopd_pct = drug.site_of_service_hopd_pct
+        total_claims = getattr(drug, "total_claims", 0)
 
         # Calculate excess HOPD claims above 40% target
-        target_hopd_pct = 0.40
         excess_hopd_pct = hopd_pct - target_hopd_pct
         excess_hopd_claims = total_claims * excess_hopd_pct
-        # HOPD costs ~2x office; facility fee markup is roughly 50% of drug cost
         est_savings = excess_hopd_claims * avg_cost * 0.50
 
-        if est_savings < 5000:
-            continue
-
         flags.append(ValidationFlag(
             flag_id=_next_id(), severity="YELLOW", category="specialty",
             metric_name="site_of_service_opportunity",
@@ -241,11 +281,11 @@ def _rule_eol_acp_correlation(quality_df, contract):
     contract_id = contract["contract_id"]
 
     # Check ACP rate first
-    acp_rows = quality_df[quality_df["measure_id"] == "ONC-Q-009"]
-    if len(acp_rows) == 0:
+    acp_pos = first_positions(quality_df["measure_id"]).get("ONC-Q-009")
+    if acp_pos is None:
         return flags
 
-    acp_rate = acp_rows.iloc[0].get("rate", 1.0)
+    acp_rate = value_at(quality_df, "rate", acp_pos, 1.0)
     if pd.isna(acp_rate) or acp_rate >= 0.50:
         return flags
 
@@ -258,18 +298,16 @@ def _rule_eol_acp_correlation(quality_df, contract):
         "ONC-Q-006": ("ER Within 30 Days of Death", "high_is_bad"),
     }
 
-    eol_failures = 0
-    for _, row in quality_df.iterrows():
-        mid = row.get("measure_id", "")
-        if mid in eol_measures:
-            rate = row.get("rate", 0)
-            target = row.get("target", 0)
-            _, direction = eol_measures[mid]
-            if pd.notna(rate) and pd.notna(target):
-                if direction == "high_is_bad" and rate > target:
-                    eol_failures += 1
-                elif direction == "low_is_bad" and rate < target:
-                    eol_failures += 1
+    # Every row of an EOL measure counts, so this is a mask over the whole
+    # frame rather than one lookup per measure; NaN rates or targets fail
+    # both comparisons.
+    directions = quality_df["measure_id"].map(
+        {mid: direction for mid, (_, direction) in eol_measures.items()})
+    rates = float_column(quality_df, "rate", 0)
+    targets = float_column(quality_df, "target", 0)
+    failing = (((directions == "high_is_bad").to_numpy(dtype=bool) & (rates > targets))
+               | ((directions == "low_is_bad").to_numpy(dtype=bool) & (rates < targets)))
+    eol_failures = int(np.count_nonzero(failing))
 
     if eol_failures >= 3:
         flags.append(ValidationFlag(
@@ -315,28 +353,28 @@ def _rule_novel_therapy_impact(drugs_df, episodes_df, contract):
 
     cutoff_date = data_as_of - relativedelta(months=lookback_months)
 
+    # Parse approval dates for the whole column at once; dates that do not
+    # parse become NaT and fail the cutoff comparison, as before.
+    if "is_novel_therapy" in drugs_df.columns and "fda_approval_date" in drugs_df.columns:
+        is_novel = _is_true(drugs_df["is_novel_therapy"])
+        fda_dates = pd.to_datetime(drugs_df["fda_approval_date"].astype(str),
+                                   format="%Y-%m-%d", errors="coerce")
+        recent_novel = is_novel & (fda_dates >= cutoff_date).to_numpy(dtype=bool)
+    else:
+        recent_novel = np.zeros(len(drugs_df), dtype=bool)
+
     novel_drugs = []
     novel_total_cost = 0
 
-    for _, drug in drugs_df.iterrows():
-        if str(drug.get("is_novel_therapy", False)).lower() != "true":
-            continue
-
-        fda_date_str = drug.get("fda_approval_date", "")
-        try:
-            fda_date = datetime.strptime(str(fda_date_str), "%Y-%m-%d")
-        except (ValueError, TypeError):
-            continue
-
-        if fda_date >= cutoff_date:
-            cost = drug.get("total_cost", 0)
-            novel_drugs.append({
-                "name": drug.get("drug_name", ""),
-                "fda_date": fda_date_str,
-                "total_cost": cost,
-                "claims": drug.get("total_claims", 0),
-            })
-            novel_total_cost += cost
+    for drug in drugs_df.iloc[np.flatnonzero(recent_novel)].itertuples(index=False, name="Drug"):
+        cost = getattr(drug, "total_cost", 0)
+        novel_drugs.append({
+            "name": getattr(drug, "drug_name", ""),
+            "fda_date": drug.fda_approval_date,
+            "total_cost": cost,
+            "claims": getattr(drug, "total_claims", 0),
+        })
+        novel_total_cost += cost
 
     if not novel_drugs:
         return flags
@@ -388,13 +426,19 @@ def _rule_volume_vs_incidence(episodes_df, reference_ranges, contract):
 
     incidence_rates = reference_ranges.get("incidence_rates_ma_per_1000", {})
 
-    # Sum episodes by cancer type
-    cancer_volumes = {}
-    for _, row in episodes_df.iterrows():
-        cancer = row.get("cancer_type", "")
-        count = row.get("episode_count", 0)
-        if pd.notna(count):
-            cancer_volumes[cancer] = cancer_volumes.get(cancer, 0) + count
+    # Sum episodes by cancer type, in order of first appearance. np.add.at
+    # accumulates row by row, so totals match a running sum exactly, and
+    # types whose counts are all missing get no entry.
+    cancer_types = (episodes_df["cancer_type"] if "cancer_type" in episodes_df.columns
+                    else pd.Series("", index=episodes_df.index))
+    counts = (episodes_df["episode_count"] if "episode_count" in episodes_df.columns
+              else pd.Series(0, index=episodes_df.index))
+    counted = counts.notna().to_numpy()
+    codes, cancers = pd.factorize(cancer_types[counted])
+    values = counts.to_numpy()[counted]
+    totals = np.zeros(len(cancers), dtype=values.dtype)
+    np.add.at(totals, codes[codes >= 0], values[codes >= 0])
+    cancer_volumes = dict(zip(cancers.tolist(), totals.tolist()))
 
     for cancer_type, total_count in cancer_volumes.items():
         ref_key = CANCER_TYPE_MAP.get(cancer_type)
@@ -457,12 +501,15 @@ def _rule_quality_gate_financial_impact(quality_df, episodes_df, contract):
     contract_id = contract["contract_id"]
     gate_min = contract.get("quality_gate_minimum", 0)
 
-    comp_row = quality_df[quality_df["measure_id"].str.contains("COMP", na=False)]
-    if len(comp_row) == 0:
+    # Composite IDs are per-contract (e.g. ONC-Q-COMP); the same mask picks
+    # the composite row here and the individual measures below.
+    is_comp = quality_df["measure_id"].str.contains("COMP", na=False, regex=False).to_numpy(dtype=bool)
+    comp_positions = np.flatnonzero(is_comp)
+    if len(comp_positions) == 0:
         return flags
 
-    earned = comp_row.iloc[0].get("points_earned", 0)
-    max_pts = comp_row.iloc[0].get("max_points", 0)
+    earned = value_at(quality_df, "points_earned", comp_positions[0], 0)
+    max_pts = value_at(quality_df, "max_points", comp_positions[0], 0)
     if pd.isna(earned) or pd.isna(max_pts) or max_pts == 0:
         return flags
 
@@ -473,37 +520,35 @@ def _rule_quality_gate_financial_impact(quality_df, episodes_df, contract):
         return flags
 
     # Calculate total savings at risk
-    total_savings = 0
-    for _, row in episodes_df.iterrows():
-        tc = row.get("total_cost", 0)
-        tt = row.get("total_target", 0)
-        if pd.notna(tc) and pd.notna(tt):
-            total_savings += (tt - tc)
+    # Rows missing either total give NaN and are skipped by nansum
+    total_savings = np.nansum(float_column(episodes_df, "total_target", 0)
+                              - float_column(episodes_df, "total_cost", 0))
 
     sharing_rate = contract.get("sharing_rate_savings", 0)
     at_risk = max(0, total_savings) * sharing_rate
 
-    # Find measures closest to improving
-    non_comp = quality_df[~quality_df["measure_id"].str.contains("COMP", na=False)]
-    improvement_candidates = []
-
-    for _, row in non_comp.iterrows():
-        current_pts = row.get("points_earned", 0)
-        max_measure_pts = row.get("max_points", 0)
-        gap_pts = max_measure_pts - current_pts
-        if pd.notna(gap_pts) and gap_pts > 0:
-            improvement_candidates.append({
-                "measure": row.get("measure_name", ""),
-                "current_points": current_pts,
-                "max_points": max_measure_pts,
-                "gap": gap_pts,
-                "rate": row.get("rate"),
-                "target": row.get("target"),
-            })
-
-    # Sort by gap (smallest first — easiest to improve)
-    improvement_candidates.sort(key=lambda x: x["gap"])
-    top_candidates = improvement_candidates[:3]
+    # Find measures closest to improving: rank the open point gaps of the
+    # non-composite measures (smallest first — easiest to improve) and
+    # build entries only for the top three. The sort is stable, so ties keep
+    # scorecard order.
+    non_comp_positions = np.flatnonzero(~is_comp)
+    gaps = (float_column(quality_df, "max_points", 0)
+            - float_column(quality_df, "points_earned", 0))[non_comp_positions]
+    open_gap = gaps > 0
+    top_positions = non_comp_positions[open_gap][np.argsort(gaps[open_gap], kind="stable")[:3]]
+
+    top_candidates = []
+    for row in quality_df.iloc[top_positions].itertuples(index=False, name="Measure"):
+        current_pts = getattr(row, "points_earned", 0)
+        max_measure_pts = getattr(row, "max_points", 0)
+        top_candidates.append({
+            "measure": getattr(row, "measure_name", ""),
+            "current_points": current_pts,
+            "max_points": max_measure_pts,
+            "gap": max_measure_pts - current_pts,
+            "rate": getattr(row, "rate", None),
+            "target": getattr(row, "target", None),
+        })
 
     candidate_text = "; ".join([
         f"{c['measure']} ({c['current_points']}/{c['max_points']}, gap={c['gap']}pts)"
@@ -3,14 +3,10 @@
 import pandas as pd
 import numpy as np
 from validation import ValidationFlag
+from validation._frame_utils import episode_types, flag_id_sequence, float_column
 
-_range_counter = 0
 
-
-def _next_id():
-    global _range_counter
-    _range_counter += 1
-    return f"RANGE-{_range_counter:03d}"
+_next_id = flag_id_sequence("RANGE")
 
 
 # Maps episode_type strings to reference range keys
@@ -37,19 +33,63 @@ ONC_EP_TYPE_MAP = {
     ("Prostate", "Advanced", "1L"): "prostate_advanced",
 }
 
+# (column, reference key) pairs checked on surgical MSK episodes, in flag order
+MSK_UTILIZATION_METRICS = [
+    ("avg_opioid_mme_discharge", "opioid_mme_discharge_avg"),
+    ("prom_collection_rate", "prom_collection_rate"),
+]
+MSK_QUALITY_METRICS = [
+    ("readmission_rate", "readmit_90day"),
+    ("er_visit_rate_90d", "er_visit_90day"),
+    ("ssi_rate", "ssi_rate"),
+    ("revision_rate_12mo", "revision_12mo"),
+]
+
+
+def _range_severity(values: np.ndarray, range_def: dict) -> np.ndarray:
+    """Severity of each value against range_def: "RED", "YELLOW" or "" (no flag).
+
+    This is the single place range thresholds are decided; _check_range
+    classifies its one value here too. NaN never flags.
+    """
+    min_val = range_def.get("min", range_def.get("min_acceptable"))
+    max_val = range_def.get("max", range_def.get("max_acceptable"))
+    expected = range_def.get("expected", range_def.get("target"))
+    red = yellow = np.zeros(len(values), dtype=bool)
+
+    if min_val is not None and max_val is not None:
+        red = (values < min_val) | (values > max_val)
+        # Within bounds but far from expected
+        range_width = max_val - min_val
+        if expected is not None and range_width > 0:
+            with np.errstate(invalid="ignore"):
+                yellow = np.abs(values - expected) / range_width > 0.4
+    elif max_val is not None:
+        # Target-based (like quality targets with max_acceptable)
+        red = values > max_val
+        target = range_def.get("target")
+        if target is not None:
+            yellow = values > target
+
+    return np.where(red, "RED", np.where(yellow, "YELLOW", ""))
+
 
 def _check_range(value, range_def, metric_name, ep_label, contract_id):
     """Check a single value against a range definition. Returns a flag or None."""
     if pd.isna(value):
         return None
 
+    severity = _range_severity(np.array([value], dtype=np.float64), range_def)[0]
+    if not severity:
+        return None
+
     min_val = range_def.get("min", range_def.get("min_acceptable"))
     max_val = range_def.get("max", range_def.get("max_acceptable"))
     expected = range_def.get("expected", range_def.get("target"))
     desc = range_def.get("description", "")
 
-    if min_val is not None and max_val is not None:
-        if value < min_val or value > max_val:
+    if min_val is not None:
+        if severity == "RED":
             return ValidationFlag(
                 flag_id=_next_id(), severity="RED", category="range",
                 metric_name=metric_name, metric_value=value,
@@ -60,48 +100,67 @@ def _check_range(value, range_def, metric_name, ep_label, contract_id):
                 detail=f"{desc}. Value {value} falls outside the acceptable range. "
                        f"Expected approximately {expected}.",
             )
-        elif expected is not None:
-            # Within bounds but check if it's far from expected
-            range_width = max_val - min_val
-            if range_width > 0:
-                deviation = abs(value - expected) / range_width
-                if deviation > 0.4:
-                    return ValidationFlag(
-                        flag_id=_next_id(), severity="YELLOW", category="range",
-                        metric_name=metric_name, metric_value=value,
-                        expected_value=f"expected ~{expected} (range [{min_val}, {max_val}])",
-                        episode_type=ep_label, contract_id=contract_id,
-                        description=f"{metric_name} = {value} is within bounds but "
-                                    f"significantly deviates from expected {expected} for {ep_label}",
-                        detail=f"{desc}. Value is within [{min_val}, {max_val}] but "
-                               f"deviates {deviation:.0%} of range width from expected.",
-                    )
-    elif max_val is not None:
-        # Target-based (like quality targets with max_acceptable)
-        target = range_def.get("target")
-        if value > max_val:
-            return ValidationFlag(
-                flag_id=_next_id(), severity="RED", category="range",
-                metric_name=metric_name, metric_value=value,
-                expected_value=f"target {target}, max acceptable {max_val}",
-                episode_type=ep_label, contract_id=contract_id,
-                description=f"{metric_name} = {value} exceeds maximum acceptable "
-                            f"{max_val} for {ep_label}",
-                detail=f"{desc}. Target is {target}, maximum acceptable is {max_val}.",
-            )
-        elif target is not None and value > target:
-            return ValidationFlag(
-                flag_id=_next_id(), severity="YELLOW", category="range",
-                metric_name=metric_name, metric_value=value,
-                expected_value=f"target {target}",
-                episode_type=ep_label, contract_id=contract_id,
-                description=f"{metric_name} = {value} exceeds target {target} "
-                            f"for {ep_label} (but within acceptable range)",
-                detail=f"{desc}. Value exceeds target but remains below "
-                       f"maximum acceptable threshold of {max_val}.",
-            )
+        deviation = abs(value - expected) / (max_val - min_val)
+        return ValidationFlag(
+            flag_id=_next_id(), severity="YELLOW", category="range",
+            metric_name=metric_name, metric_value=value,
+            expected_value=f"expected ~{expected} (range [{min_val}, {max_val}])",
+            episode_type=ep_label, contract_id=contract_id,
+            description=f"{metric_name} = {value} is within bounds but "
+                        f"significantly deviates from expected {expected} for {ep_label}",
+            detail=f"{desc}. Value is within [{min_val}, {max_val}] but "
+                   f"deviates {deviation:.0%} of range width from expected.",
+        )
+
+    target = range_def.get("target")
+    if severity == "RED":
+        return ValidationFlag(
+            flag_id=_next_id(), severity="RED", category="range",
+            metric_name=metric_name, metric_value=value,
+            expected_value=f"target {target}, max acceptable {max_val}",
+            episode_type=ep_label, contract_id=contract_id,
+            description=f"{metric_name} = {value} exceeds maximum acceptable "
+                        f"{max_val} for {ep_label}",
+            detail=f"{desc}. Target is {target}, maximum acceptable is {max_val}.",
+        )
+    return ValidationFlag(
+        flag_id=_next_id(), severity="YELLOW", category="range",
+        metric_name=metric_name, metric_value=value,
+        expected_value=f"target {target}",
+        episode_type=ep_label, contract_id=contract_id,
+        description=f"{metric_name} = {value} exceeds target {target} "
+                    f"for {ep_label} (but within acceptable range)",
+        detail=f"{desc}. Value exceeds target but remains below "
+               f"maximum acceptable threshold of {max_val}.",
+    )
 
-    return None
+
+def _onc_ref_keys(episodes_df: pd.DataFrame) -> np.ndarray:
+    """ONC_EP_TYPE_MAP ref key per row, None where the triple is not mapped."""
+    parts = [episodes_df[col].tolist() if col in episodes_df.columns else [""] * len(episodes_df)
+             for col in ("cancer_type", "stage_group", "line_of_therapy")]
+    return np.array([ONC_EP_TYPE_MAP.get(key) for key in zip(*parts)], dtype=object)
+
+
+def _check_metric_ranges(episodes_df, eligible, metrics, ranges, contract_id):
+    """Range-check (column, reference key) metrics on the eligible rows.
+
+    Rows are screened with _range_severity first; each screened row is then
+    checked metric by metric, so flags come out in the same row-major order.
+    """
+    metrics = [(col, ranges[ref_key]) for col, ref_key in metrics if ref_key in ranges]
+    flagged = np.zeros(len(episodes_df), dtype=bool)
+    for col, range_def in metrics:
+        flagged |= _range_severity(float_column(episodes_df, col, np.nan), range_def) != ""
+
+    flags = []
+    for row in episodes_df.iloc[np.flatnonzero(eligible & flagged)].itertuples(index=False, name="Episode"):
+        ep_type = getattr(row, "episode_type", "")
+        for col, range_def in metrics:
+            flag = _check_range(getattr(row, col, None), range_def, col, ep_type, contract_id)
+            if flag:
+                flags.append(flag)
+    return flags
 
 
 def validate_ranges(episodes_df: pd.DataFrame, reference_ranges: dict,
@@ -114,108 +173,108 @@ def validate_ranges(episodes_df: pd.DataFrame, reference_ranges: dict,
     cost_ranges = reference_ranges.get("episode_cost_ranges", {})
 
     if specialty == "MSK":
-        for _, row in episodes_df.iterrows():
-            ep_type = row.get("episode_type", "")
-            ref_key = MSK_EP_TYPE_MAP.get(ep_type)
-            if ref_key and ref_key in cost_ranges:
-                flag = _check_range(
-                    row.get("avg_episode_cost"), cost_ranges[ref_key],
-                    "avg_episode_cost", ep_type, contract_id
-                )
-                if flag:
-                    flags.append(flag)
+        ep_types = episode_types(episodes_df)
 
-        # Check utilization ranges
-        util_ranges = reference_ranges.get("utilization_ranges_ma", {})
-        for _, row in episodes_df.iterrows():
-            ep_type = row.get("episode_type", "")
-            if "Conservative" in str(ep_type):
-                continue
+        # Cost ranges depend on the episode type: screen each type's rows
+        # against its own range and run _check_range only on rows that flag.
+        ref_keys = ep_types.map(MSK_EP_TYPE_MAP)
+        costs = float_column(episodes_df, "avg_episode_cost", np.nan)
+        cost_flagged = np.zeros(len(episodes_df), dtype=bool)
+        for ref_key, range_def in cost_ranges.items():
+            cost_flagged |= ((ref_keys == ref_key).to_numpy(dtype=bool)
+                             & (_range_severity(costs, range_def) != ""))
 
-            # Opioid MME
-            if pd.notna(row.get("avg_opioid_mme_discharge")) and "opioid_mme_discharge_avg" in util_ranges:
-                flag = _check_range(
-                    row.get("avg_opioid_mme_discharge"),
-                    util_ranges["opioid_mme_discharge_avg"],
-                    "avg_opioid_mme_discharge", ep_type, contract_id
-                )
-                if flag:
-                    flags.append(flag)
+        for row in episodes_df.iloc[np.flatnonzero(cost_flagged)].itertuples(index=False, name="Episode"):
+            ep_type = row.episode_type
+            flag = _check_range(
+                row.avg_episode_cost, cost_ranges[MSK_EP_TYPE_MAP[ep_type]],
+                "avg_episode_cost", ep_type, contract_id
+            )
+            if flag:
+                flags.append(flag)
 
-            # PROM collection rate
-            if pd.notna(row.get("prom_collection_rate")) and "prom_collection_rate" in util_ranges:
-                flag = _check_range(
-                    row.get("prom_collection_rate"),
-                    util_ranges["prom_collection_rate"],
-                    "prom_collection_rate", ep_type, contract_id
-                )
-                if flag:
-                    flags.append(flag)
+        # Utilization ranges and quality targets apply to surgical episodes
+        surgical = ~ep_types.astype(str).str.contains(
+            "Conservative", na=False, regex=False).to_numpy(dtype=bool)
+
+        # Check utilization ranges
+        util_ranges = reference_ranges.get("utilization_ranges_ma", {})
+        flags += _check_metric_ranges(episodes_df, surgical, MSK_UTILIZATION_METRICS,
+                                      util_ranges, contract_id)
 
         # Quality targets
         quality_targets = reference_ranges.get("quality_targets", {})
-        for _, row in episodes_df.iterrows():
-            ep_type = row.get("episode_type", "")
-            if "Conservative" in str(ep_type):
-                continue
-            for metric, ref_key in [("readmission_rate", "readmit_90day"),
-                                     ("er_visit_rate_90d", "er_visit_90day"),
-                                     ("ssi_rate", "ssi_rate"),
-                                     ("revision_rate_12mo", "revision_12mo")]:
-                val = row.get(metric)
-                if pd.notna(val) and ref_key in quality_targets:
-                    flag = _check_range(val, quality_targets[ref_key],
-                                        metric, ep_type, contract_id)
-                    if flag:
-                        flags.append(flag)
+        flags += _check_metric_ranges(episodes_df, surgical, MSK_QUALITY_METRICS,
+                                      quality_targets, contract_id)
 
     elif specialty == "Oncology":
-        for _, row in episodes_df.iterrows():
-            cancer = row.get("cancer_type", "")
-            stage = row.get("stage_group", "")
-            line = row.get("line_of_therapy", "")
+        pathway_benchmarks = reference_ranges.get("pathway_adherence_benchmarks", {})
+        ref_keys = _onc_ref_keys(episodes_df)
+        costs = float_column(episodes_df, "avg_episode_cost", np.nan)
+        adherence_rates = float_column(episodes_df, "pathway_adherence_rate", np.nan)
+
+        cost_flagged = np.zeros(len(episodes_df), dtype=bool)
+        for ref_key, range_def in cost_ranges.items():
+            cost_flagged |= (ref_keys == ref_key) & (_range_severity(costs, range_def) != "")
+
+        # Pathway severity for every row at once; NaN adherence and rows
+        # without a benchmark compare False and stay unflagged.
+        min_rates = np.full(len(episodes_df), np.nan)
+        expected_rates = np.full(len(episodes_df), np.nan)
+        for ref_key, benchmark in pathway_benchmarks.items():
+            is_key = ref_keys == ref_key
+            min_rates[is_key] = benchmark.get("min_acceptable", 0)
+            expected_rates[is_key] = benchmark.get("expected", 0)
+        pathway_severity = np.where(adherence_rates < min_rates, "RED",
+                                    np.where(adherence_rates < expected_rates, "YELLOW", ""))
+
+        candidates = np.flatnonzero(cost_flagged | (pathway_severity != ""))
+        for pos, row in zip(candidates.tolist(),
+                            episodes_df.iloc[candidates].itertuples(index=False, name="Episode")):
+            cancer = getattr(row, "cancer_type", "")
+            stage = getattr(row, "stage_group", "")
+            line = getattr(row, "line_of_therapy", "")
             ep_label = f"{cancer} {stage} {line}".strip()
-            ref_key = ONC_EP_TYPE_MAP.get((cancer, stage, line))
+            ref_key = ref_keys[pos]
 
-            if ref_key and ref_key in cost_ranges:
+            if cost_flagged[pos]:
                 flag = _check_range(
-                    row.get("avg_episode_cost"), cost_ranges[ref_key],
+                    row.avg_episode_cost, cost_ranges[ref_key],
                     "avg_episode_cost", ep_label, contract_id
                 )
                 if flag:
                     flags.append(flag)
 
             # Pathway adherence
-            pathway_benchmarks = reference_ranges.get("pathway_adherence_benchmarks", {})
-            if ref_key and ref_key in pathway_benchmarks:
-                adherence = row.get("pathway_adherence_rate")
-                if pd.notna(adherence):
-                    benchmark = pathway_benchmarks[ref_key]
-                    min_acceptable = benchmark.get("min_acceptable", 0)
-                    expected = benchmark.get("expected", 0)
-                    if adherence < min_acceptable:
-                        flags.append(ValidationFlag(
-                            flag_id=_next_id(), severity="RED", category="range",
-                            metric_name="pathway_adherence_rate",
-                            metric_value=adherence,
-                            expected_value=f"min acceptable {min_acceptable}, expected {expected}",
-                            episode_type=ep_label, contract_id=contract_id,
-                            description=f"Pathway adherence {adherence:.0%} below minimum "
-                                        f"acceptable {min_acceptable:.0%} for {ep_label}",
-                            detail=f"Expected adherence of {expected:.0%}. Current rate is "
-                                   f"significantly below benchmark.",
-                        ))
-                    elif adherence < expected:
-                        flags.append(ValidationFlag(
-                            flag_id=_next_id(), severity="YELLOW", category="range",
-                            metric_name="pathway_adherence_rate",
-                            metric_value=adherence,
-                            expected_value=f"expected {expected}",
-                            episode_type=ep_label, contract_id=contract_id,
-                            description=f"Pathway adherence {adherence:.0%} below expected "
-                                        f"{expected:.0%} for {ep_label}",
-                            detail=f"Rate is above minimum acceptable ({min_acceptable:.0%}) "
-                                   f"but below expected benchmark.",
-                        ))
+            severity = pathway_severity[pos]
+            if severity:
+                adherence = row.pathway_adherence_rate
+                benchmark = pathway_benchmarks[ref_key]
+                min_acceptable = benchmark.get("min_acceptable", 0)
+                expected = benchmark.get("expected", 0)
+                if severity == "RED":
+                    flags.append(ValidationFlag(
+                        flag_id=_next_id(), severity="RED", category="range",
+                        metric_name="pathway_adherence_rate",
+                        metric_value=adherence,
+                        expected_value=f"min acceptable {min_acceptable}, expected {expected}",
+                        episode_type=ep_label, contract_id=contract_id,
+                        description=f"Pathway adherence {adherence:.0%} below minimum "
+                                    f"acceptable {min_acceptable:.0%} for {ep_label}",
+                        detail=f"Expected adherence of {expected:.0%}. Current rate is "
+                               f"significantly below benchmark.",
+                    ))
+                else:
+                    flags.append(ValidationFlag(
+                        flag_id=_next_id(), severity="YELLOW", category="range",
+                        metric_name="pathway_adherence_rate",
+                        metric_value=adherence,
+                        expected_value=f"expected {expected}",
+                        episode_type=ep_label, contract_id=contract_id,
+                        description=f"Pathway adherence {adherence:.0%} below expected "
+                                    f"{expected:.0%} for {ep_label}",
+                        detail=f"Rate is above minimum acceptable ({min_acceptable:.0%}) "
+                               f"but below expected benchmark.",
+                    ))
 
     return flags
@@ -3,6 +3,7 @@
 import pandas as pd
 import numpy as np
 from validation import ValidationFlag
+from validation._frame_utils import flag_id_sequence
 
 # Expected columns per dataset
 EXPECTED_COLUMNS = {
@@ -96,26 +97,25 @@ RATE_COLUMNS = {
     ],
 }
 
-_schema_counter = 0
+# Set views of the column lists above, for membership tests
+EXPECTED_COLUMN_SETS = {name: frozenset(cols) for name, cols in EXPECTED_COLUMNS.items()}
+NUMERIC_COLUMN_SETS = {name: frozenset(cols) for name, cols in NUMERIC_COLUMNS.items()}
 
 
-def _next_id():
-    global _schema_counter
-    _schema_counter += 1
-    return f"SCHEMA-{_schema_counter:03d}"
+_next_id = flag_id_sequence("SCHEMA")
 
 
 def validate_schema(df: pd.DataFrame, dataset_name: str, contract: dict) -> list[ValidationFlag]:
     """Run all schema validation checks on a dataframe."""
-    global _schema_counter
     flags = []
     contract_id = contract["contract_id"]
 
     # 1. Column presence
     expected = EXPECTED_COLUMNS.get(dataset_name, [])
-    actual = list(df.columns)
-    missing = [c for c in expected if c not in actual]
-    extra = [c for c in actual if c not in expected]
+    present = set(df.columns)
+    expected_set = EXPECTED_COLUMN_SETS.get(dataset_name, frozenset())
+    missing = [c for c in expected if c not in present]
+    extra = [c for c in df.columns if c not in expected_set]
 
     for col in missing:
         flags.append(ValidationFlag(
@@ -125,7 +125,7 @@ def validate_schema(df: pd.DataFrame, dataset_name: str, contract: dict) -> list
             episode_type="ALL", contract_id=contract_id,
             description=f"Missing expected column '{col}' in {dataset_name}",
             detail=f"The column '{col}' is expected in {dataset_name} but was not found. "
-                   f"Available columns: {actual}",
+                   f"Available columns: {list(df.columns)}",
         ))
 
     for col in extra:
@@ -139,30 +139,32 @@ def validate_schema(df: pd.DataFrame, dataset_name: str, contract: dict) -> list
         ))
 
     # 2. Data types — check numeric columns are numeric
+    # Dtypes are checked from df.dtypes in one pass; dropna() only runs for a
+    # column that is not numeric. (select_dtypes("number") would also accept
+    # timedelta columns, which is_numeric_dtype rejects.)
     numeric_cols = NUMERIC_COLUMNS.get(dataset_name, [])
+    numeric_set = NUMERIC_COLUMN_SETS.get(dataset_name, frozenset())
+    non_numeric = {c for c, dtype in df.dtypes.items() if not pd.api.types.is_numeric_dtype(dtype)}
     for col in numeric_cols:
-        if col not in df.columns:
+        if col not in non_numeric:
             continue
         non_null = df[col].dropna()
         if len(non_null) == 0:
             continue
-        if not pd.api.types.is_numeric_dtype(non_null):
-            flags.append(ValidationFlag(
-                flag_id=_next_id(), severity="RED", category="schema",
-                metric_name=col, metric_value=str(non_null.dtype),
-                expected_value="numeric",
-                episode_type="ALL", contract_id=contract_id,
-                description=f"Column '{col}' in {dataset_name} is not numeric",
-                detail=f"Expected numeric type but found {non_null.dtype}. "
-                       f"Sample values: {list(non_null.head(3))}",
-            ))
+        flags.append(ValidationFlag(
+            flag_id=_next_id(), severity="RED", category="schema",
+            metric_name=col, metric_value=str(non_null.dtype),
+            expected_value="numeric",
+            episode_type="ALL", contract_id=contract_id,
+            description=f"Column '{col}' in {dataset_name} is not numeric",
+            detail=f"Expected numeric type but found {non_null.dtype}. "
+                   f"Sample values: {list(non_null.head(3))}",
+        ))
 
     # 3. Null/missing values in critical fields
-    critical = CRITICAL_FIELDS.get(dataset_name, [])
-    for col in critical:
-        if col not in df.columns:
-            continue
-        null_count = df[col].isna().sum()
+    critical = [c for c in CRITICAL_FIELDS.get(dataset_name, []) if c in present]
+    null_counts = df[critical].isna().sum().tolist()
+    for col, null_count in zip(critical, null_counts):
         if null_count > 0:
             flags.append(ValidationFlag(
                 flag_id=_next_id(), severity="RED", category="schema",
@@ -175,87 +177,92 @@ def validate_schema(df: pd.DataFrame, dataset_name: str, contract: dict) -> list
 
     # 4. Value constraints
     # episode_count >= 0
-    if "episode_count" in df.columns:
-        neg = df[df["episode_count"] < 0]
-        if len(neg) > 0:
+    if "episode_count" in present:
+        negative = df["episode_count"] < 0
+        if negative.any():
+            neg_counts = df.loc[negative, "episode_count"].tolist()
             flags.append(ValidationFlag(
                 flag_id=_next_id(), severity="RED", category="schema",
-                metric_name="episode_count", metric_value=list(neg["episode_count"]),
+                metric_name="episode_count", metric_value=neg_counts,
                 expected_value=">= 0",
                 episode_type="ALL", contract_id=contract_id,
                 description=f"Negative episode counts found in {dataset_name}",
-                detail=f"Found {len(neg)} rows with negative episode counts.",
+                detail=f"Found {len(neg_counts)} rows with negative episode counts.",
             ))
 
     # costs >= 0
-    cost_cols = [c for c in df.columns if "cost" in c.lower() and c in numeric_cols]
-    for col in cost_cols:
-        if col not in df.columns:
-            continue
-        neg = df[df[col].notna() & (df[col] < 0)]
-        if len(neg) > 0:
+    cost_cols = [c for c in df.columns if "cost" in c.lower() and c in numeric_set]
+    # NaN compares False, so one reduction over the block counts every column
+    neg_counts = (df[cost_cols].to_numpy(dtype=np.float64, na_value=np.nan) < 0).sum(axis=0).tolist()
+    for col, neg_count in zip(cost_cols, neg_counts):
+        if neg_count > 0:
             flags.append(ValidationFlag(
                 flag_id=_next_id(), severity="RED", category="schema",
-                metric_name=col, metric_value=f"{len(neg)} negative values",
+                metric_name=col, metric_value=f"{neg_count} negative values",
                 expected_value=">= 0",
                 episode_type="ALL", contract_id=contract_id,
                 description=f"Negative cost values in '{col}' in {dataset_name}",
-                detail=f"Cost fields should not be negative. Found {len(neg)} negative values.",
+                detail=f"Cost fields should not be negative. Found {neg_count} negative values.",
             ))
 
     # Rate columns between 0 and 1
-    rate_cols = RATE_COLUMNS.get(dataset_name, [])
-    for col in rate_cols:
-        if col not in df.columns:
-            continue
-        non_null = df[col].dropna()
-        if len(non_null) == 0:
-            continue
-        out_of_range = non_null[(non_null < 0) | (non_null > 1)]
-        if len(out_of_range) > 0:
+    rate_cols = [c for c in RATE_COLUMNS.get(dataset_name, []) if c in present]
+    rates = df[rate_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+    out_counts = ((rates < 0) | (rates > 1)).sum(axis=0).tolist()
+    for col, out_count in zip(rate_cols, out_counts):
+        if out_count > 0:
+            # min/max come from the column itself so they print in its own dtype
+            col_min, col_max = df[col].min(), df[col].max()
             # Check if they might be percentages (0-100 scale)
-            if non_null.max() > 1 and non_null.max() <= 100:
+            if col_max > 1 and col_max <= 100:
                 flags.append(ValidationFlag(
                     flag_id=_next_id(), severity="YELLOW", category="schema",
-                    metric_name=col, metric_value=f"max={non_null.max()}",
+                    metric_name=col, metric_value=f"max={col_max}",
                     expected_value="0-1 proportion scale",
                     episode_type="ALL", contract_id=contract_id,
                     description=f"Rate column '{col}' appears to be on 0-100 scale instead of 0-1",
-                    detail=f"Values range from {non_null.min()} to {non_null.max()}. "
+                    detail=f"Values range from {col_min} to {col_max}. "
                            f"These may need to be divided by 100.",
                 ))
             else:
                 flags.append(ValidationFlag(
                     flag_id=_next_id(), severity="RED", category="schema",
-                    metric_name=col, metric_value=f"{len(out_of_range)} values outside [0,1]",
+                    metric_name=col, metric_value=f"{out_count} values outside [0,1]",
                     expected_value="Between 0 and 1",
                     episode_type="ALL", contract_id=contract_id,
                     description=f"Rate column '{col}' has values outside valid range in {dataset_name}",
-                    detail=f"Found {len(out_of_range)} values outside [0,1] range.",
+                    detail=f"Found {out_count} values outside [0,1] range.",
                 ))
 
     # Discharge dispositions sum to ~100% for surgical episodes
     if dataset_name == "msk_episodes":
         disp_cols = ["discharge_home_pct", "discharge_snf_pct", "discharge_irf_pct", "discharge_other_pct"]
-        if all(c in df.columns for c in disp_cols):
-            for _, row in df.iterrows():
-                ep_type = row.get("episode_type", "unknown")
-                if "Conservative" in str(ep_type):
-                    continue
-                vals = [row[c] for c in disp_cols if pd.notna(row[c])]
-                if vals:
-                    total = sum(vals)
-                    if abs(total - 1.0) > 0.02:
-                        flags.append(ValidationFlag(
-                            flag_id=_next_id(), severity="YELLOW", category="schema",
-                            metric_name="discharge_disposition_sum",
-                            metric_value=round(total, 4),
-                            expected_value="~1.0 (within 2%)",
-                            episode_type=ep_type, contract_id=contract_id,
-                            description=f"Discharge dispositions sum to {total:.1%} for {ep_type}",
-                            detail=f"Expected discharge percentages to sum to ~100%. "
-                                   f"Values: {dict(zip(disp_cols, vals))}",
-                        ))
+        if all(c in present for c in disp_cols):
+            # Row sums over the four columns, skipping NaN; rows with no values
+            # at all and Conservative episodes are never flagged.
+            disp = df[disp_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+            has_value = ~np.isnan(disp)
+            with np.errstate(invalid="ignore"):
+                totals = np.where(has_value, disp, 0.0).sum(axis=1)
+                off = has_value.any(axis=1) & (np.abs(totals - 1.0) > 0.02)
+            if "episode_type" in present:
+                off &= ~df["episode_type"].astype(str).str.contains(
+                    "Conservative", na=False, regex=False).to_numpy(dtype=bool)
+
+            for row in df.iloc[np.flatnonzero(off)].itertuples(index=False, name="Episode"):
+                ep_type = getattr(row, "episode_type", "unknown")
+                vals = [v for v in (getattr(row, c) for c in disp_cols) if pd.notna(v)]
+                total = sum(vals)
+                flags.append(ValidationFlag(
+                    flag_id=_next_id(), severity="YELLOW", category="schema",
+                    metric_name="discharge_disposition_sum",
+                    metric_value=round(total, 4),
+                    expected_value="~1.0 (within 2%)",
+                    episode_type=ep_type, contract_id=contract_id,
+                    description=f"Discharge dispositions sum to {total:.1%} for {ep_type}",
+                    detail=f"Expected discharge percentages to sum to ~100%. "
+                           f"Values: {dict(zip(disp_cols, vals))}",
+                ))
 
     # All checks passed notification
     if not flags: